@@ -0,0 +1 @@
+"""Offline benchmarks: synthetic data, a local warehouse stand-in and a loader runner (``python -m bench.run``)."""
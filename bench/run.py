@@ -0,0 +1,167 @@
+"""Benchmark every loader on a synthetic dataset, without warehouse credentials.
+
+    python -m bench.run --events 1_000_000
+    python -m bench.run --data .bench/10m --events 10_000_000 --csv bench_output.csv
+
+The runner generates (or reuses) a synthetic dataset and points
+``run_query`` at the local stand-in. It then calls every shared loader in
+``core.loaders`` and every call in each page's ``load_concurrently`` block,
+with the same arguments the page passes. Each call is timed cold and warm.
+A cold run clears ``st.cache_data`` and ``st.cache_resource``, like a
+restarted process; state kept on disk (the dataset, built snapshots and
+the first-seen index files) stays, as it would across a restart. The warm
+run is served from both caches.
+
+Peak memory is the Python-side peak seen by ``tracemalloc``, which counts
+pandas and numpy buffers but not DuckDB's own memory.
+"""
+import argparse
+import ast
+import glob
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+import core.loaders
+import core.snapshots
+from bench.standin import LocalWarehouse, install
+from bench.synthetic import SyntheticStaking
+from core.buckets import DISTRIBUTIONS
+from core.nakamoto import DEFAULT_THRESHOLD
+from core.snapshots import build_snapshots
+
+PAGES_DIR = Path(__file__).resolve().parent.parent / "pages"
+DEFAULT_EVENTS = 100_000
+
+# Tables loaded on demand rather than in a page's load_concurrently block: (page prefix, loader, argument source).
+LAZY_CALLS = [
+    ("1_", "load_whale_events_page", "DEFAULT_WHALE_THRESHOLD, start_date, end_date, first_whale_cursor(end_date)"),
+    ("4_", "load_top_delegators", "load_active_validators_list()['Address'][0]"),
+]
+
+
+def _rows(result):
+    # Frames count their rows; containers add up their frames; anything else (sketches) has no row count.
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return len(result)
+    parts = result.values() if isinstance(result, dict) else result if isinstance(result, (tuple, list)) else ()
+    counts = [count for count in map(_rows, parts) if count is not None]
+    return sum(counts) if counts else None
+
+
+def _page_namespace(path):
+    """Imports, upper-case constants and functions of a page script, without running its UI code."""
+    tree = ast.parse(Path(path).read_text())
+    keep = [node for node in tree.body
+            if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef))
+            or (isinstance(node, ast.Assign) and all(isinstance(t, ast.Name) and t.id.isupper() for t in node.targets))]
+    namespace = {"__name__": f"bench.pages.{Path(path).stem}"}
+    exec(compile(ast.Module(body=keep, type_ignores=[]), str(path), "exec"), namespace)
+    # Default edges: the dashboard's [buckets] secrets are not available offline.
+    namespace["bucket_edges"] = lambda name: tuple(float(edge) for edge in DISTRIBUTIONS[name]["edges"])
+    return namespace, tree
+
+
+def _page_calls(tree):
+    """``(loader name, argument source)`` for every ``(load_x, ...)`` tuple passed to ``load_concurrently``."""
+    calls = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "load_concurrently":
+            for call in node.args:
+                if isinstance(call, ast.Tuple) and isinstance(call.elts[0], ast.Name):
+                    calls.append((call.elts[0].id, ", ".join(ast.unparse(arg) for arg in call.elts[1:])))
+    return calls
+
+
+def collect_calls(inputs):
+    """``(page, loader, thunk)`` for every shared loader and every page loader call."""
+    calls = [("core.loaders", name, getattr(core.loaders, name))
+             for name in sorted(vars(core.loaders)) if name.startswith("load_")]
+    for path in sorted(glob.glob(str(PAGES_DIR / "*.py"))):
+        namespace, tree = _page_namespace(path)
+        page = Path(path).stem.split("_", 1)[0]
+        page_calls = _page_calls(tree) + [(name, args) for prefix, name, args in LAZY_CALLS if Path(path).name.startswith(prefix)]
+        # Inputs become page globals: some loaders read the page's widgets directly.
+        namespace.update(inputs)
+        for name, args in page_calls:
+            calls.append((page, name, lambda name=name, args=args, scope=namespace: eval(f"{name}({args})", scope)))
+    return calls
+
+
+def measure(thunk, repeat=1):
+    """Cold latency (median of ``repeat``), warm latency, Python peak memory in MB and result rows."""
+    cold, peak = [], 0
+    for _ in range(repeat):
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        tracemalloc.start()
+        started = time.perf_counter()
+        result = thunk()
+        cold.append(time.perf_counter() - started)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    started = time.perf_counter()
+    thunk()
+    warm = time.perf_counter() - started
+    return statistics.median(cold), warm, peak / 2 ** 20, _rows(result)
+
+
+def run(warehouse, inputs, repeat=1, only=None):
+    """One row per loader call with its cold/warm latency (ms), peak memory (MB) and rows."""
+    uninstall = install(warehouse)
+    try:
+        rows = []
+        for page, name, thunk in collect_calls(inputs):
+            if only and only not in name:
+                continue
+            cold, warm, peak, count = measure(thunk, repeat)
+            rows.append({"Page": page, "Loader": name, "Cold (ms)": round(cold * 1e3, 1),
+                         "Warm (ms)": round(warm * 1e3, 2), "Peak Memory (MB)": round(peak, 1), "Rows": count})
+        return pd.DataFrame(rows).astype({"Rows": "Int64"}) if rows else pd.DataFrame(rows)
+    finally:
+        uninstall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=DEFAULT_EVENTS, help="staking events to generate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data", help="dataset directory; generated there unless it already holds one")
+    parser.add_argument("--days", type=int, default=365, help="length of the benchmarked date range")
+    parser.add_argument("--timeframe", default="week")
+    parser.add_argument("--repeat", type=int, default=1, help="cold runs per loader (the median is reported)")
+    parser.add_argument("--only", help="benchmark only loaders whose name contains this")
+    parser.add_argument("--snapshots", action="store_true", help="build core.snapshots first, so loaders read them")
+    parser.add_argument("--csv", help="also write the results to this CSV file")
+    args = parser.parse_args(argv)
+
+    root = Path(args.data or tempfile.mkdtemp(prefix="axelar-bench-"))
+    if not (root / "fact_validators.parquet").exists():
+        started = time.perf_counter()
+        counts = SyntheticStaking(args.events, seed=args.seed).write(root)
+        print(f"generated {', '.join(f'{t}={n:,}' for t, n in counts.items())} in {time.perf_counter() - started:.1f}s -> {root}")
+
+    warehouse = LocalWarehouse(root)
+    if args.snapshots:
+        uninstall = install(warehouse)
+        try:
+            build_snapshots(core.snapshots.get_snapshot_store())
+        finally:
+            uninstall()
+    end_date = (warehouse.watermark("fact_staking") - pd.Timedelta(days=1)).date()
+    inputs = {"timeframe": args.timeframe, "start_date": end_date - pd.Timedelta(days=args.days - 1), "end_date": end_date,
+              "power": "quadratic", "threshold": DEFAULT_THRESHOLD}
+    df = run(warehouse, inputs, repeat=args.repeat, only=args.only)
+    print(df.to_string(index=False))
+    print(f"\ntotal cold: {df['Cold (ms)'].sum() / 1e3:.2f}s, max peak memory: {df['Peak Memory (MB)'].max():.1f} MB")
+    if args.csv:
+        df.to_csv(args.csv, index=False)
+
+
+if __name__ == "__main__":
+    main()
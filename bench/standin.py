@@ -0,0 +1,102 @@
+"""Local stand-in for the warehouse, so every registered query runs offline.
+
+``LocalWarehouse`` is a ``core.mirror.StakingMirror`` over a synthetic
+dataset (see ``bench.synthetic``) that also serves
+``axelar.gov.fact_validators``. Mirror queries already stay within SQL that
+DuckDB and Snowflake share. Warehouse-only queries may use a few Snowflake
+forms, which ``snowflake_to_duckdb`` rewrites:
+- self-referencing CTEs without ``recursive``
+- ``dateadd``
+- unquoted ``date_trunc`` parts
+- ``current_date()``
+- ``lag(...) ignore nulls``
+- ``ceil`` returning an integer
+
+``install`` routes ``core.queries.run_query`` to the stand-in, whatever
+the query's source. It also points ``core.snapshots`` at
+``<root>/snapshots``, which stays empty (so loaders compute live) unless
+the snapshots are built there, and keeps the ``core.firstseen`` index under
+``<root>/first_seen``. The index object is held in ``st.cache_resource``
+as in the app, so clearing that cache reloads it from disk.
+"""
+import re
+
+import streamlit as st
+
+import core.firstseen
+import core.queries
+import core.snapshots
+from core.mirror import StakingMirror
+
+VALIDATORS_SOURCE = "axelar.gov.fact_validators"
+
+_REWRITES = (
+    (re.compile(r"\bwith\b(?!\s+recursive)", re.IGNORECASE), "with recursive"),
+    (re.compile(r"\bdateadd\(\s*(\w+)\s*,\s*([^,]+?)\s*,\s*([^()]+?)\s*\)", re.IGNORECASE), r"(\3 + interval (\2) \1)"),
+    (re.compile(r"\bdate_trunc\(\s*(\w+)\s*,", re.IGNORECASE), r"date_trunc('\1',"),
+    (re.compile(r"\bcurrent_date\(\)", re.IGNORECASE), "current_date"),
+    (re.compile(r"\b(lag|lead)\(([^()]*)\)\s+ignore nulls\s+over", re.IGNORECASE), r"\1(\2 ignore nulls) over"),
+)
+_CEIL = re.compile(r"\bceil\(", re.IGNORECASE)
+
+
+def _cast_ceil(sql):
+    # Snowflake's ceil of a number has scale 0; DuckDB's is a double ("2.0" once concatenated).
+    out, position = [], 0
+    for match in _CEIL.finditer(sql):
+        if match.start() < position:
+            continue
+        depth, end = 1, match.end()
+        while depth:
+            depth += {"(": 1, ")": -1}.get(sql[end], 0)
+            end += 1
+        out.append(sql[position:match.start()] + f"cast({sql[match.start():end]} as bigint)")
+        position = end
+    return "".join(out) + sql[position:]
+
+
+def snowflake_to_duckdb(sql):
+    """Rewrite the Snowflake-only forms used in ``core.queries`` into DuckDB SQL."""
+    for pattern, replacement in _REWRITES:
+        sql = pattern.sub(replacement, sql)
+    return _cast_ceil(sql)
+
+
+class LocalWarehouse(StakingMirror):
+    """A synthetic mirror that never syncs and answers warehouse-dialect SQL."""
+
+    def __init__(self, root):
+        super().__init__(root, sync_interval=float("inf"))
+        validators = (self.root / "fact_validators.parquet").as_posix()
+        self._db.execute(f"create or replace view fact_validators as select * from read_parquet('{validators}')")
+
+    def ensure_fresh(self):
+        return None
+
+    def query(self, query, params=None):
+        query = re.sub(re.escape(VALIDATORS_SOURCE) + r"\b", "fact_validators", query, flags=re.IGNORECASE)
+        return super().query(snowflake_to_duckdb(query), params)
+
+
+@st.cache_resource
+def _first_seen_index(root):
+    return core.firstseen.FirstSeenIndex(root)
+
+
+def install(warehouse):
+    """Send every ``run_query`` to ``warehouse``; returns a function that undoes it."""
+    def read(query, params=None, tag=None):
+        return warehouse.query(query, params)
+
+    store = core.snapshots.SnapshotStore(warehouse.root / "snapshots")
+    saved = (core.queries.read_mirror, core.queries.read_warehouse, core.snapshots.get_snapshot_store,
+             core.firstseen.get_first_seen_index)
+    core.queries.read_mirror = core.queries.read_warehouse = read
+    core.snapshots.get_snapshot_store = lambda: store
+    core.firstseen.get_first_seen_index = lambda: _first_seen_index(warehouse.root / "first_seen")
+
+    def uninstall():
+        (core.queries.read_mirror, core.queries.read_warehouse, core.snapshots.get_snapshot_store,
+         core.firstseen.get_first_seen_index) = saved
+
+    return uninstall
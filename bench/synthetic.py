@@ -0,0 +1,141 @@
+"""Seeded synthetic ``fact_staking``, ``fact_staking_rewards`` and ``fact_validators``.
+
+The tables have the warehouse columns the dashboard reads and the shapes
+that make its queries expensive:
+- Delegator activity follows a power law: a few whales make most txns,
+  and a long tail stakes once.
+- Stake concentrates on a few validators.
+- Redelegations move stake between two validators.
+- Amounts are log-normal with a Pareto tail.
+
+Timestamps are spread uniformly from ``start`` to ``end``.
+
+Events are generated in time-ordered chunks and written straight into the
+mirror's Parquet layout (see ``core.mirror``), so 50M events never sit in
+memory at once and ``core.mirror.StakingMirror`` can open the result as is.
+"""
+import numpy as np
+import pandas as pd
+
+from core.mirror import StakingMirror
+
+DEFAULT_START = "2022-02-10"
+DEFAULT_CHUNK_ROWS = 1_000_000
+DELEGATORS_PER_EVENT = 0.1     # distinct delegators per staking event
+REWARDS_PER_EVENT = 0.6        # reward claims per staking event
+VALIDATORS = 75
+DELEGATOR_EXPONENT = 1.1       # Zipf exponent of delegator activity
+VALIDATOR_EXPONENT = 0.8       # Zipf exponent of validator popularity
+ACTIONS = (("delegate", 0.7), ("undelegate", 0.15), ("redelegate", 0.15))
+UAXL = 1e6
+
+
+def _zipf_weights(n, exponent):
+    weights = 1 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _addresses(prefix, n, seed):
+    # Bech32-length and stable for a seed: a shuffled counter in hex.
+    codes = np.random.default_rng(seed).permutation(n) + 16 ** 9
+    return np.char.add(prefix, np.char.zfill(np.char.mod("%x", codes), 38)).astype(object)
+
+
+def _tx_ids(prefix, first, n):
+    return np.char.add(prefix, np.char.zfill(np.arange(first, first + n).astype("U"), 14)).astype(object)
+
+
+def _timestamps(rng, start, end, first, n, total):
+    # Chunk ``first`` of ``total`` covers its share of the span, so chunks come out in time order.
+    span = (end - start) / total
+    offsets = np.sort(rng.random(n)) * (span * n).value
+    return start + span * first + pd.to_timedelta(offsets.astype(np.int64), unit="ns")
+
+
+def _amounts(rng, n, median_axl, tail_share=0.01):
+    amounts = rng.lognormal(np.log(median_axl), 1.5, n)
+    whales = rng.random(n) < tail_share
+    amounts[whales] *= rng.pareto(1.2, whales.sum()) * 100 + 10
+    return np.round(amounts * UAXL)
+
+
+class SyntheticStaking:
+    """Generator of the three tables for ``events`` staking events; everything is fixed by ``seed``."""
+
+    def __init__(self, events, seed=0, start=DEFAULT_START, end=None):
+        self.events = int(events)
+        self.seed = seed
+        self.start = pd.Timestamp(start)
+        self.end = pd.Timestamp.today().normalize() if end is None else pd.Timestamp(end)
+        self.delegators = _addresses("axelar1", max(int(self.events * DELEGATORS_PER_EVENT), 10), seed)
+        self.validators = _addresses("axelarvaloper1", VALIDATORS, seed + 1)
+        self._delegator_weights = _zipf_weights(len(self.delegators), DELEGATOR_EXPONENT)
+        self._validator_weights = _zipf_weights(VALIDATORS, VALIDATOR_EXPONENT)
+
+    def _rng(self, table, chunk):
+        return np.random.default_rng([self.seed, {"staking": 0, "rewards": 1}[table], chunk])
+
+    def staking_chunk(self, first, n):
+        """``n`` staking events starting at event number ``first``."""
+        rng = self._rng("staking", first)
+        actions = rng.choice([a for a, _ in ACTIONS], n, p=[p for _, p in ACTIONS])
+        validators = rng.choice(VALIDATORS, n, p=self._validator_weights)
+        # Source validator of a redelegation: any other validator.
+        sources = (validators + rng.integers(1, VALIDATORS, n)) % VALIDATORS
+        amounts = _amounts(rng, n, median_axl=500)
+        amounts[actions != "delegate"] *= 0.5
+        return pd.DataFrame({
+            "BLOCK_TIMESTAMP": _timestamps(rng, self.start, self.end, first, n, self.events),
+            "TX_ID": _tx_ids("STK", first, n),
+            "TX_SUCCEEDED": rng.random(n) > 0.01,
+            "CURRENCY": "uaxl",
+            "ACTION": actions,
+            "DELEGATOR_ADDRESS": self.delegators[rng.choice(len(self.delegators), n, p=self._delegator_weights)],
+            "VALIDATOR_ADDRESS": self.validators[validators],
+            "REDELEGATE_SOURCE_VALIDATOR_ADDRESS": np.where(actions == "redelegate", self.validators[sources], None),
+            "AMOUNT": np.round(amounts),
+        })
+
+    def rewards_chunk(self, first, n, total):
+        """``n`` of ``total`` reward claims starting at claim number ``first``."""
+        rng = self._rng("rewards", first)
+        return pd.DataFrame({
+            "BLOCK_TIMESTAMP": _timestamps(rng, self.start, self.end, first, n, total),
+            "TX_ID": _tx_ids("RWD", first, n),
+            "TX_SUCCEEDED": rng.random(n) > 0.01,
+            "CURRENCY": "uaxl",
+            "ACTION": "withdraw_rewards",
+            "DELEGATOR_ADDRESS": self.delegators[rng.choice(len(self.delegators), n, p=self._delegator_weights)],
+            "VALIDATOR_ADDRESS": self.validators[rng.choice(VALIDATORS, n, p=self._validator_weights)],
+            "AMOUNT": _amounts(rng, n, median_axl=5),
+        })
+
+    def validators_table(self):
+        """``fact_validators``: one labelled row per validator."""
+        return pd.DataFrame({
+            "ADDRESS": self.validators,
+            "LABEL": [f"Validator {i + 1:02d}" for i in range(VALIDATORS)],
+            "RANK": np.arange(1, VALIDATORS + 1),
+            "STATUS": "BOND_STATUS_BONDED",
+            "COMMISSION_RATE": np.round(np.random.default_rng(self.seed).uniform(0.01, 0.1, VALIDATORS), 3),
+        })
+
+    def write(self, root, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Write all three tables under ``root`` as a ready mirror; returns the row count per table."""
+        mirror = StakingMirror(root)
+        rewards = int(self.events * REWARDS_PER_EVENT)
+        counts = {}
+        for table, total, make in (("fact_staking", self.events, self.staking_chunk),
+                                   ("fact_staking_rewards", rewards, lambda first, n: self.rewards_chunk(first, n, rewards))):
+            mirror._table_dir(table).mkdir(parents=True, exist_ok=True)
+            newest = None
+            for n, first in enumerate(range(0, total, chunk_rows)):
+                newest = mirror._write_chunk(table, make(first, min(chunk_rows, total - first)), "synthetic", n)
+            if newest is not None:
+                mirror._publish(table)
+                mirror._save_watermark(table, newest)
+            counts[table] = total
+        validators = self.validators_table()
+        validators.to_parquet(mirror.root / "fact_validators.parquet", index=False)
+        counts["fact_validators"] = len(validators)
+        return counts
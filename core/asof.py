@@ -0,0 +1,66 @@
+"""Point-in-time balances from periodic checkpoints plus replayed deltas.
+
+"Net staked as of D" used to mean rebuilding every holder's balance from
+the whole event log (or reading the last row of a full daily series).
+``BalanceCheckpoints`` sorts the signed balance changes once and stores a
+dense per-holder balance vector at the start of every period (monthly by
+default). A query for day D takes the latest checkpoint on or before D and
+replays only the events between it and D, so it costs one period of events
+instead of the full history.
+
+Balances are rounded to uaxl precision (6 decimals), so a holder who has
+fully exited reads 0 rather than float residue.
+
+Memory is (checkpoints x holders) float64: about 8 MB per 100k holders
+over a year of monthly checkpoints.
+"""
+import numpy as np
+import pandas as pd
+
+from core.ledger import MIN_BALANCE
+from core.rollup import truncate
+
+DEFAULT_EVERY = "month"
+
+
+class BalanceCheckpoints:
+    """Per-holder balances at every period start of a signed event log, answering any day by replay."""
+
+    def __init__(self, days, holders, amounts, every=DEFAULT_EVERY):
+        days = np.asarray(pd.to_datetime(pd.Series(days)).dt.normalize(), dtype="datetime64[D]")
+        codes, self.labels = pd.factorize(np.asarray(holders))
+        amounts = np.asarray(amounts, dtype=np.float64)
+
+        order = np.argsort(days, kind="stable")
+        self._days, self._codes, self._amounts = days[order], codes[order], amounts[order]
+
+        # Checkpoint k holds every balance before the k-th period start, i.e. after events [0, _positions[k]).
+        self.checkpoint_days = np.unique(np.asarray(truncate(self._days, every), dtype="datetime64[D]"))
+        self._positions = np.searchsorted(self._days, self.checkpoint_days)
+        self._checkpoints = np.empty((len(self.checkpoint_days), len(self.labels)))
+        balances, done = np.zeros(len(self.labels)), 0
+        for k, position in enumerate(self._positions):
+            balances += self._replay(done, position)
+            self._checkpoints[k], done = balances, position
+
+    def _replay(self, low, high):
+        return np.bincount(self._codes[low:high], weights=self._amounts[low:high], minlength=len(self.labels))
+
+    def balances(self, day):
+        """Every holder's balance at the end of ``day``, aligned with ``labels``."""
+        day = np.datetime64(pd.Timestamp(day), "D")
+        k = np.searchsorted(self.checkpoint_days, day, side="right") - 1
+        if k < 0:
+            return np.zeros(len(self.labels))
+        replayed = self._replay(self._positions[k], np.searchsorted(self._days, day, side="right"))
+        return np.round(self._checkpoints[k] + replayed, 6)
+
+    def as_of(self, day):
+        """Holder -> balance at the end of ``day``, as a Series."""
+        return pd.Series(self.balances(day), index=self.labels)
+
+    def total(self, day, min_balance=MIN_BALANCE):
+        """``(sum, count)`` of the balances at the end of ``day`` that are at least ``min_balance``."""
+        balances = self.balances(day)
+        counted = balances >= min_balance
+        return float(balances[counted].sum()), int(counted.sum())
@@ -0,0 +1,86 @@
+"""Start-up helpers: lazy imports and start-up timings.
+
+Every page used to import plotly, networkx and (through ``core``) the
+Snowflake connector before its first element was drawn. A fresh replica
+paid about 0.7s of imports before the title showed, most of it for modules
+the first screen does not need. ``lazy_import`` returns a stand-in module
+that imports the real one on first attribute access, i.e. when the first
+chart is built. ``core.connection`` and ``core.fetch`` import the connector
+only when a warehouse statement actually runs.
+
+Pages call ``page_started()`` after their imports and ``first_paint()``
+once their title is on screen. The resulting timings are reported by
+``core.metrics``:
+- per-run first paint
+- the first paint of the process (cold start, measured from when this
+  module was first imported)
+- the import time of every lazily imported module
+"""
+import importlib
+import threading
+import time
+import types
+
+PROCESS_STARTED = time.perf_counter()
+FIRST_PAINT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)   # seconds
+
+_lock = threading.Lock()
+_local = threading.local()
+_import_seconds = {}
+_first_paint = {"cold_start": None, "count": 0, "sum": 0.0, "buckets": [0] * len(FIRST_PAINT_BUCKETS)}
+
+
+def _timed_import(name):
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    with _lock:
+        _import_seconds.setdefault(name, time.perf_counter() - started)
+    return module
+
+
+class LazyModule(types.ModuleType):
+    """Module stand-in that imports ``name`` on first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self.__dict__["_module"] = _timed_import(self.__name__)
+        return getattr(self._module, attr)
+
+
+def lazy_import(name):
+    """``import name`` deferred until the module is first used."""
+    return LazyModule(name)
+
+
+def page_started():
+    """Mark the start of a page run (call right after the page's imports)."""
+    _local.started = time.perf_counter()
+
+
+def first_paint():
+    """Mark the page's first visible content and record the time since ``page_started``."""
+    now = time.perf_counter()
+    elapsed = now - getattr(_local, "started", now)
+    with _lock:
+        if _first_paint["cold_start"] is None:
+            _first_paint["cold_start"] = now - PROCESS_STARTED
+        _first_paint["count"] += 1
+        _first_paint["sum"] += elapsed
+        for i, bound in enumerate(FIRST_PAINT_BUCKETS):
+            _first_paint["buckets"][i] += elapsed <= bound
+    _local.last_first_paint = elapsed
+
+
+def last_first_paint():
+    """First-paint seconds of the latest run on this thread, or ``None``."""
+    return getattr(_local, "last_first_paint", None)
+
+
+def startup_timings():
+    """Copy of the first-paint counters and the lazy import seconds per module."""
+    with _lock:
+        return {**_first_paint, "buckets": list(_first_paint["buckets"])}, dict(_import_seconds)
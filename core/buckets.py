@@ -0,0 +1,66 @@
+"""Histogram bucketing for the distribution charts.
+
+Every distribution on the dashboard is a count per value class with
+right-closed edges ("10<V<=100 AXL"). The edges used to be hand-written
+CASE ladders, one per chart. They are declared once in ``DISTRIBUTIONS``
+instead, and ``histogram`` buckets a cached per-address or per-tx
+aggregate in a single ``np.digitize`` pass, so changing the edges never
+needs another query.
+
+Edges can be overridden per distribution from the ``[buckets]`` secrets
+section, e.g. ``staker_volume = [100, 1000, 10000]``.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Values are >= ``floor`` when one is given, so the lowest class reads "n=1 Txn".
+DISTRIBUTIONS = {
+    "staking_txn_volume": {"edges": (1, 10, 100, 1e3, 1e4, 1e5, 1e6), "symbol": "V", "unit": "AXL"},
+    "staker_txn_count": {"edges": (1, 5, 10, 20, 50, 100), "symbol": "n", "unit": "Txns", "floor": 1},
+    "staker_volume": {"edges": (10, 100, 1e3, 1e4, 1e5, 1e6, 1e7), "symbol": "V", "unit": "AXL"},
+    "claimer_volume": {"edges": (10, 100, 1e3, 1e4, 1e5, 1e6), "symbol": "V", "unit": "AXL"},
+    "claim_txn_volume": {"edges": (1, 5, 10, 100, 1e3, 1e4, 1e5, 1e6), "symbol": "V", "unit": "AXL"},
+}
+
+
+def _short(value):
+    for scale, suffix in ((1e9, "B"), (1e6, "M"), (1e3, "k")):
+        if abs(value) >= scale:
+            return f"{value / scale:g}{suffix}"
+    return f"{value:g}"
+
+
+def bucket_edges(name):
+    """Edges of distribution ``name``: the ``[buckets]`` secret if set, else the default."""
+    edges = st.secrets.get("buckets", {}).get(name, DISTRIBUTIONS[name]["edges"])
+    return tuple(sorted(float(edge) for edge in edges))
+
+
+def bucket_labels(name, edges):
+    """Class label for every bucket of ``edges``, lowest first (``len(edges) + 1`` labels)."""
+    spec = DISTRIBUTIONS[name]
+    symbol, unit = spec["symbol"], spec["unit"]
+    labels = [f"{symbol}<={_short(edges[0])} {unit}"]
+    if edges[0] == spec.get("floor"):
+        labels[0] = f"{symbol}={_short(edges[0])} {unit.removesuffix('s') if edges[0] == 1 else unit}"
+    labels += [f"{_short(low)}<{symbol}<={_short(high)} {unit}" for low, high in zip(edges, edges[1:])]
+    labels.append(f"{symbol}>{_short(edges[-1])} {unit}")
+    return labels
+
+
+def histogram(values, name, count_name, edges=None, keys=None):
+    """Count of ``values`` per class of distribution ``name``, largest class first.
+
+    With ``keys`` (e.g. tx ids), each (key, class) pair is counted once, like
+    ``count(distinct key)`` per class. Empty classes are dropped.
+    """
+    edges = bucket_edges(name) if edges is None else tuple(edges)
+    codes = np.digitize(np.asarray(values, dtype=np.float64), edges, right=True)
+    if keys is not None:
+        codes = pd.DataFrame({"key": np.asarray(keys), "code": codes}).drop_duplicates()["code"].to_numpy()
+
+    counts = np.bincount(codes, minlength=len(edges) + 1)
+    df = pd.DataFrame({"Class": bucket_labels(name, edges), count_name: counts})
+    df = df[df[count_name] > 0]
+    return df.sort_values(count_name, ascending=False, kind="stable").reset_index(drop=True)
@@ -0,0 +1,76 @@
+"""Cache policy for the ``load_*`` functions.
+
+Plain ``@st.cache_data`` keeps an entry until the process restarts, so
+loaders relative to ``current_date`` served yesterday's answer and the only
+fix was a restart that emptied every cache at once. ``cached_loader`` adds
+the source tables' data version (their latest ``block_timestamp``) to the
+cache key, so an entry is recomputed exactly when new rows land. It also
+sets a TTL and ``max_entries`` so that entries for superseded versions age out,
+and records every call with ``core.metrics``.
+
+``st.cache_data`` pickles the result and unpickles a fresh copy on every
+hit. Loaders that return query structures (sketches, rolling windows,
+checkpoints) use ``cached_resource`` instead, which shares one object per
+data version, so whatever it memoizes survives across reruns. Those
+objects are read-only for callers.
+"""
+import datetime
+import functools
+
+import streamlit as st
+
+from core.metrics import instrumented, mark_miss
+from core.queries import run_query
+
+DEFAULT_TTL = "1d"
+DEFAULT_MAX_ENTRIES = 32
+VERSION_PROBE_TTL = 60   # seconds a data version is trusted before probing again
+
+
+@st.cache_data(ttl=VERSION_PROBE_TTL, show_spinner=False)
+def data_version(source):
+    """Latest ``block_timestamp`` of ``axelar.gov.<source>``; answered by the mirror when it is synced."""
+    return str(run_query(f"data_version.{source}")["Version"][0])
+
+
+def _versioned_cache(cache, sources, daily):
+    def decorator(func):
+        @functools.wraps(func)
+        def versioned(versions, *args, **kwargs):
+            mark_miss()
+            return func(*args, **kwargs)
+
+        cached = cache(versioned)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            versions = tuple(data_version(source) for source in sources)
+            if daily:
+                versions += (datetime.date.today().isoformat(),)
+            return cached(versions, *args, **kwargs)
+
+        wrapper.clear = cached.clear
+        return instrumented(wrapper)
+
+    return decorator
+
+
+def cached_loader(*sources, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, daily=False):
+    """``st.cache_data`` keyed additionally on the data version of ``sources``.
+
+    Loaders whose result depends on the current date (balances as of today,
+    "31 days ago") pass ``daily=True`` to key on today's date as well, so a
+    new day recomputes them even when no rows have landed.
+
+    Usage::
+
+        @cached_loader("fact_staking", ttl="1h")
+        def load_something(start_date, end_date):
+            ...
+    """
+    return _versioned_cache(st.cache_data(ttl=ttl, max_entries=max_entries, show_spinner=False), sources, daily)
+
+
+def cached_resource(*sources, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, daily=False):
+    """``cached_loader`` on ``st.cache_resource``: every hit returns the same object, which callers must not modify."""
+    return _versioned_cache(st.cache_resource(ttl=ttl, max_entries=max_entries, show_spinner=False), sources, daily)
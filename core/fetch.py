@@ -0,0 +1,97 @@
+"""Arrow-native result fetching from the warehouse.
+
+``pd.read_sql`` builds its DataFrame row by row from the DBAPI cursor. The
+Snowflake connector can instead hand over its result chunks as Arrow tables,
+which convert to pandas column by column (zero-copy for null-free numeric
+columns with ``split_blocks``) and, fetched batch by batch, never hold the
+whole result as Python objects.
+
+Connections use qmark (``?``) bind variables, bound server-side, and each
+statement can carry a Snowflake ``query_tag``. The tag is a session
+parameter, so it is only set again when a pooled connection's previous
+statement carried a different one. Query ids are reported to
+``core.metrics`` for the loader that issued them.
+"""
+import weakref
+
+import pandas as pd
+import pyarrow as pa
+
+from core.connection import borrow_connection
+from core.metrics import note_query
+
+DEFAULT_BATCH_ROWS = 200_000
+QUERY_TAG_PREFIX = "axelar_staking"
+
+_session_tags = weakref.WeakKeyDictionary()   # connection -> query_tag its session currently has
+
+
+def query_tag(name):
+    """Snowflake ``query_tag`` for the statement registered as ``name``."""
+    return f"{QUERY_TAG_PREFIX}:{name}"
+
+
+def _to_pandas(table):
+    # self_destruct releases each Arrow column as soon as it has been converted.
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _execute(cursor, query, params, tag):
+    if tag and _session_tags.get(cursor.connection) != tag:
+        cursor.execute(f"alter session set query_tag = '{tag}'")
+        _session_tags[cursor.connection] = tag
+    cursor.execute(query, params)
+    note_query(cursor.sfqid)
+
+
+def _columns(cursor):
+    return [column[0] for column in cursor.description]
+
+
+def fetch_frame(conn, query, params=None, tag=None):
+    """Run ``query`` on ``conn`` and return the whole result as one DataFrame."""
+    from snowflake.connector.errors import NotSupportedError
+
+    with conn.cursor() as cursor:
+        _execute(cursor, query, params, tag)
+        try:
+            table = cursor.fetch_arrow_all(force_return_table=True)
+        except NotSupportedError:
+            # Statements whose result is not served as Arrow (e.g. ``show``).
+            return pd.DataFrame(cursor.fetchall(), columns=_columns(cursor))
+        return _to_pandas(table)
+
+
+def fetch_batches(conn, query, params=None, batch_rows=DEFAULT_BATCH_ROWS, tag=None):
+    """Run ``query`` on ``conn`` and yield the result as DataFrames of about ``batch_rows`` rows.
+
+    Arrow chunks are coalesced until they hold at least ``batch_rows`` rows
+    (the last batch may be smaller), so only one batch is ever converted at a
+    time. Nothing is yielded for an empty result.
+    """
+    from snowflake.connector.errors import NotSupportedError
+
+    with conn.cursor() as cursor:
+        _execute(cursor, query, params, tag)
+        try:
+            chunks = cursor.fetch_arrow_batches(force_microsecond_precision=True)
+        except NotSupportedError:
+            while rows := cursor.fetchmany(batch_rows):
+                yield pd.DataFrame(rows, columns=_columns(cursor))
+            return
+
+        pending, pending_rows = [], 0
+        for chunk in chunks:
+            pending.append(chunk)
+            pending_rows += chunk.num_rows
+            if pending_rows >= batch_rows:
+                yield _to_pandas(pa.concat_tables(pending))
+                pending, pending_rows = [], 0
+        if pending_rows:
+            yield _to_pandas(pa.concat_tables(pending))
+
+
+def read_warehouse(query, params=None, tag=None):
+    """``fetch_frame`` on a pooled connection."""
+    with borrow_connection() as conn:
+        return fetch_frame(conn, query, params, tag=tag)
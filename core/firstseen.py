@@ -0,0 +1,162 @@
+"""Persistent first-seen index: each address's first stake, first claim and last activity day.
+
+New-vs-returning stakers took every delegator's first day from the whole
+history on each call, and the join-quarter chart scanned the full table for
+it again in the warehouse. ``FirstSeenIndex`` keeps one row per address with
+four day columns, plus a ``block_timestamp`` watermark per source table:
+- ``First Stake``: first successful delegation
+- ``Joined``: first successful delegation or undelegation (the join date
+  of the stakers-by-quarter chart, which also covers stake that predates
+  the table)
+- ``First Claim``: first successful reward claim
+- ``Last Activity``: latest successful staking txn or claim
+
+``refresh`` reads only the events after the watermarks, already reduced to
+one row per address, and merges them with ``min``/``max``. The merge is
+idempotent, so a crash between saving the index and its watermarks only
+re-reads a few events. The index is saved as Parquet (with a JSON
+watermark file beside it), so a restart resumes from disk instead of the
+full history. Cohort counts are ``bincount``s over the day columns, rolled
+up with ``core.rollup``.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core.cache import data_version
+from core.metrics import mark_miss
+from core.queries import run_query
+from core.rollup import rollup
+
+# --- Settings (overridable from the [first_seen] secrets section) ---------------------------------------------------
+DEFAULT_INDEX_DIR = ".first_seen"
+FIELDS = ("First Stake", "Joined", "First Claim", "Last Activity")
+SOURCES = {   # table -> (query, the fields it can move earlier)
+    "fact_staking": ("first_seen_staking_since", ("First Stake", "Joined")),
+    "fact_staking_rewards": ("first_seen_claims_since", ("First Claim",)),
+}
+EPOCH = pd.Timestamp("1970-01-01")
+
+
+class FirstSeenIndex:
+    """One row per address with its first stake, join, first claim and last activity day, updated incrementally."""
+
+    def __init__(self, root=None):
+        self.root = None if root is None else Path(root)
+        self._lock = threading.Lock()
+        self._versions = {}
+        self.watermarks = {}
+        self.users = np.zeros(0, dtype=object)
+        self.days = {field: np.zeros(0, dtype="datetime64[D]") for field in FIELDS}
+        self._positions = {}
+        self._load()
+
+    # --- Persistence ----------------------------------------------------------------------------------------------
+    def _load(self):
+        if self.root is None or not (self.root / "watermarks.json").exists():
+            return
+        df = pd.read_parquet(self.root / "index.parquet")
+        self.users = df["User"].to_numpy(dtype=object)
+        self.days = {field: df[field].to_numpy(dtype="datetime64[D]") for field in FIELDS}
+        self._positions = {user: i for i, user in enumerate(self.users)}
+        self.watermarks = {table: pd.Timestamp(value) for table, value in
+                           json.loads((self.root / "watermarks.json").read_text()).items()}
+
+    def _save(self):
+        if self.root is None:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f"index.{os.getpid()}.tmp"
+        self._frame().to_parquet(tmp, index=False)
+        os.replace(tmp, self.root / "index.parquet")
+        tmp = self.root / f"watermarks.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps({table: value.isoformat() for table, value in self.watermarks.items()}))
+        os.replace(tmp, self.root / "watermarks.json")
+
+    # --- Updates --------------------------------------------------------------------------------------------------
+    def _merge(self, df, first_fields):
+        new_users = [user for user in df["User"] if user not in self._positions]
+        if new_users:
+            self._positions.update((user, len(self.users) + i) for i, user in enumerate(new_users))
+            self.users = np.concatenate([self.users, np.asarray(new_users, dtype=object)])
+            self.days = {field: np.concatenate([days, np.full(len(new_users), np.datetime64("NaT", "D"), dtype="datetime64[D]")])
+                         for field, days in self.days.items()}
+        rows = np.fromiter((self._positions[user] for user in df["User"]), dtype=np.int64, count=len(df))
+        for field, merge in [(field, np.fmin) for field in first_fields] + [("Last Activity", np.fmax)]:
+            days = self.days[field].copy()   # readers may hold the previous arrays
+            days[rows] = merge(days[rows], df[field].to_numpy(dtype="datetime64[D]"))
+            self.days[field] = days
+
+    def refresh(self):
+        """Merge the events newer than each source's watermark; returns the number of addresses updated."""
+        with self._lock:
+            updated = 0
+            for table, (query, first_fields) in SOURCES.items():
+                current = data_version(table)
+                if current == self._versions.get(table):
+                    continue
+                mark_miss()
+                since = self.watermarks.get(table, EPOCH)
+                # Bind parameters carry microseconds; rounding up keeps a nanosecond watermark itself excluded.
+                df = run_query(query, (since.ceil("us").to_pydatetime(),))
+                if len(df):
+                    self._merge(df, first_fields)
+                    self.watermarks[table] = pd.Timestamp(df["Last Event"].max())
+                    updated += len(df)
+                self._versions[table] = current
+            if updated:
+                self._save()
+            return updated
+
+    # --- Reads ----------------------------------------------------------------------------------------------------
+    def _frame(self):
+        return pd.DataFrame({"User": self.users, **{field: days.astype("datetime64[ns]") for field, days in self.days.items()}})
+
+    def frame(self):
+        """The index as a DataFrame: ``User`` plus one date column per field (NaT where never seen)."""
+        with self._lock:
+            return self._frame()
+
+    def lookup(self, users, field):
+        """``field`` day of each of ``users`` (NaT for unknown addresses), as a datetime64[D] array."""
+        with self._lock:
+            positions = np.fromiter((self._positions.get(user, -1) for user in users), dtype=np.int64)
+            days = self.days[field]
+        found = positions >= 0
+        out = np.full(len(positions), np.datetime64("NaT", "D"), dtype="datetime64[D]")
+        out[found] = days[positions[found]]
+        return out
+
+    def count_by_period(self, field, timeframe, name="Count", users=None):
+        """Addresses (all, or only ``users``) per ``timeframe`` period of their ``field`` day, as ``Date``/``name``."""
+        if users is None:
+            with self._lock:
+                days = self.days[field]
+        else:
+            days = self.lookup(users, field)
+        days = days[~np.isnat(days)]
+        if not len(days):
+            return pd.DataFrame({"Date": pd.Series(dtype="datetime64[ns]"), name: pd.Series(dtype="int64")})
+        start = days.min()
+        per_day = np.bincount((days - start).astype(np.int64))
+        calendar = start + np.arange(len(per_day))
+        df = pd.DataFrame({"Day": calendar.astype("datetime64[ns]"), name: per_day})
+        return rollup(df[df[name] > 0], timeframe, sums=[name])
+
+
+@st.cache_resource
+def get_first_seen_index():
+    settings = st.secrets.get("first_seen", {})
+    return FirstSeenIndex(settings.get("path", DEFAULT_INDEX_DIR))
+
+
+def current_first_seen():
+    """The process-wide index, with any new events merged in."""
+    index = get_first_seen_index()
+    index.refresh()
+    return index
@@ -0,0 +1,123 @@
+"""Redelegation flow graph between validators, kept up to date incrementally.
+
+A redelegation moves stake from ``REDELEGATE_SOURCE_VALIDATOR_ADDRESS`` to
+``VALIDATOR_ADDRESS``; elsewhere it only shows up as a balance change. Here
+every (source, target) pair is a weighted edge of a directed validator
+graph holding the total amount and the number of redelegations.
+
+One ``RedelegationFlows`` per process (``get_redelegation_flows``) holds the
+edges and the ``block_timestamp`` watermark of the newest redelegation it
+has folded in. ``refresh`` does nothing until the ``fact_staking`` data
+version moves. It then reads only the redelegations after the watermark,
+already aggregated per pair, so the cost of a rerun is bounded by the new
+events rather than by the history. Metrics are computed once per graph
+version and reused until the next change:
+- ``net_inflow``: inflow, outflow and their difference per validator
+- ``top_paths``: the heaviest source -> target flows
+- ``clusters``: modularity communities of the (undirected) flow graph
+"""
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from core.bootstrap import lazy_import
+from core.cache import data_version
+from core.metrics import mark_miss
+from core.queries import run_query
+
+nx = lazy_import("networkx")
+
+EPOCH = pd.Timestamp("1970-01-01")
+
+
+class RedelegationFlows:
+    """Weighted directed validator graph of redelegations, with metrics cached per graph version."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._edges = {}      # (source, target) -> [amount, redelegations]
+        self._metrics = {}
+        self.watermark = None
+        self.data_version = None
+        self.version = 0
+
+    def refresh(self):
+        """Fold in the redelegations newer than the watermark; returns how many (source, target) pairs changed."""
+        with self._lock:
+            current = data_version("fact_staking")
+            if current == self.data_version:
+                return 0
+            mark_miss()
+            since = self.watermark if self.watermark is not None else EPOCH
+            # Bind parameters carry microseconds; rounding up keeps a nanosecond watermark itself excluded.
+            df = run_query("redelegations_since", (since.ceil("us").to_pydatetime(),))
+            for source, target, amount, count in zip(df["Source"], df["Target"], df["Amount"], df["Redelegations"]):
+                edge = self._edges.setdefault((source, target), [0.0, 0])
+                edge[0] += amount
+                edge[1] += int(count)
+            if len(df):
+                self.watermark = pd.Timestamp(df["Last Redelegation"].max())
+                self.version += 1
+                self._metrics.clear()
+            self.data_version = current
+            return len(df)
+
+    def _metric(self, name, compute):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = compute()
+            return self._metrics[name].copy()
+
+    def _edge_frame(self):
+        rows = [(source, target, amount, count) for (source, target), (amount, count) in self._edges.items()]
+        df = pd.DataFrame(rows, columns=["Source", "Target", "Amount", "Redelegations"])
+        return df.sort_values("Amount", ascending=False, kind="stable").reset_index(drop=True)
+
+    def edges(self):
+        """Every flow as ``Source``, ``Target``, ``Amount`` and ``Redelegations``, heaviest first."""
+        return self._metric("edges", self._edge_frame)
+
+    def top_paths(self, n=20):
+        """The ``n`` heaviest flows."""
+        return self.edges().head(n)
+
+    def _net_inflow(self):
+        df = self._edge_frame()
+        inflow = df.groupby("Target")["Amount"].sum()
+        outflow = df.groupby("Source")["Amount"].sum()
+        df = pd.DataFrame({"Inflow": inflow, "Outflow": outflow}).fillna(0.0)
+        df["Net Inflow"] = df["Inflow"] - df["Outflow"]
+        df = df.rename_axis("Validator").reset_index()
+        return df.sort_values("Net Inflow", ascending=False, kind="stable").reset_index(drop=True)
+
+    def net_inflow(self):
+        """``Validator``, ``Inflow``, ``Outflow`` and ``Net Inflow`` per validator, biggest net gain first."""
+        return self._metric("net_inflow", self._net_inflow)
+
+    def graph(self):
+        """The flows as a ``networkx.DiGraph`` with ``amount`` and ``redelegations`` edge attributes."""
+        graph = nx.DiGraph()
+        with self._lock:
+            graph.add_edges_from((source, target, {"amount": amount, "redelegations": count})
+                                 for (source, target), (amount, count) in self._edges.items())
+        return graph
+
+    def _clusters(self):
+        graph = nx.Graph()
+        for (source, target), (amount, _) in self._edges.items():
+            if source != target:
+                weight = graph.get_edge_data(source, target, {"weight": 0.0})["weight"]
+                graph.add_edge(source, target, weight=weight + amount)
+        communities = nx.community.greedy_modularity_communities(graph, weight="weight") if len(graph) else []
+        rows = [(validator, cluster) for cluster, members in enumerate(communities, 1) for validator in sorted(members)]
+        return pd.DataFrame(rows, columns=["Validator", "Cluster"])
+
+    def clusters(self):
+        """``Validator`` -> ``Cluster`` (1 is the largest community of validators that trade stake)."""
+        return self._metric("clusters", self._clusters)
+
+
+@st.cache_resource
+def get_redelegation_flows():
+    return RedelegationFlows()
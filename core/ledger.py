@@ -0,0 +1,82 @@
+"""Vectorized net-staked ledger.
+
+The SQL version of "net staked over time" cross-joins every historic staker
+with a daily date spine and carries balances forward with ``lag(...) ignore
+nulls``: a (users x days) grid. Balances only change on days with events, so
+here each holder's balance is a step function and the daily total is built
+from the steps alone:
+
+1. sort events by (holder, day) and reduce them to one net change per holder-day,
+2. grouped cumulative sum -> each holder's balance after that day,
+3. the change in that holder's contribution to the total is spread onto the
+   calendar with ``bincount`` and accumulated with one ``cumsum``.
+
+Time and memory are O(events + days).
+"""
+import numpy as np
+import pandas as pd
+
+MIN_BALANCE = 0.001   # balances below this are treated as fully unstaked, as in the SQL
+
+
+def holder_day_balances(days, holders, amounts):
+    """Collapse signed events to one row per (holder, day) with the balance after that day.
+
+    Returns ``(holder_codes, day, balance, first_of_holder)`` sorted by holder then day,
+    plus the holder labels for the codes.
+    """
+    days = np.asarray(days, dtype="datetime64[D]")
+    codes, labels = pd.factorize(np.asarray(holders), sort=False)
+    amounts = np.asarray(amounts, dtype=np.float64)
+
+    order = np.lexsort((days, codes))
+    days, codes, amounts = days[order], codes[order], amounts[order]
+
+    new_run = np.ones(len(days), dtype=bool)
+    new_run[1:] = (codes[1:] != codes[:-1]) | (days[1:] != days[:-1])
+    run_start = np.flatnonzero(new_run)
+
+    run_codes = codes[run_start]
+    run_days = days[run_start]
+    change = np.add.reduceat(amounts, run_start) if len(run_start) else amounts[:0]
+    balance = pd.Series(change).groupby(run_codes).cumsum().to_numpy()
+
+    first_of_holder = np.ones(len(run_codes), dtype=bool)
+    first_of_holder[1:] = run_codes[1:] != run_codes[:-1]
+    return run_codes, run_days, balance, first_of_holder, labels
+
+
+def net_staked_series(days, holders, amounts, end=None, min_balance=MIN_BALANCE):
+    """Daily total of holder balances that are at least ``min_balance``.
+
+    ``days``/``holders``/``amounts`` are parallel arrays of signed balance
+    changes (delegate positive, undelegate negative). The result has one row
+    per calendar day from the first event to ``end`` (default: last event day)
+    with columns ``Date``, ``Net Staked`` and ``Holders``; days without any
+    qualifying holder are dropped, matching the SQL ``where balance>=0.001``.
+    """
+    _, run_days, balance, first_of_holder, _ = holder_day_balances(days, holders, amounts)
+    if len(run_days) == 0:
+        return pd.DataFrame({"Date": pd.Series(dtype="datetime64[ns]"), "Net Staked": [], "Holders": []})
+
+    counted = balance >= min_balance
+    contribution = np.where(counted, balance, 0.0)
+    prev_contribution = np.where(first_of_holder, 0.0, np.roll(contribution, 1))
+    prev_counted = np.where(first_of_holder, False, np.roll(counted, 1))
+
+    start = run_days.min()
+    end = run_days.max() if end is None else max(np.datetime64(end, "D"), start)
+    calendar = np.arange(start, end + np.timedelta64(1, "D"), dtype="datetime64[D]")
+    offset = (run_days - start).astype(np.int64)
+    keep = run_days <= end
+
+    total = np.cumsum(np.bincount(offset[keep], weights=(contribution - prev_contribution)[keep], minlength=len(calendar)))
+    holders_count = np.cumsum(np.bincount(offset[keep], weights=(counted.astype(np.int64) - prev_counted)[keep],
+                                          minlength=len(calendar)))
+
+    df = pd.DataFrame({
+        "Date": calendar.astype("datetime64[ns]"),
+        "Net Staked": total,
+        "Holders": np.rint(holders_count).astype(np.int64),
+    })
+    return df[df["Holders"] > 0].reset_index(drop=True)
@@ -0,0 +1,109 @@
+"""Day-grain loaders shared by several pages.
+
+These return full-history mergeable pieces rather than finished chart data,
+so a page can slice them to any date range and roll them up to any time
+frame (see ``core.rollup``) without another query.
+Living here rather than in a page script means every page shares one cache
+entry.
+"""
+from core.asof import BalanceCheckpoints
+from core.cache import cached_loader, cached_resource
+from core.metrics import instrumented
+from core.queries import run_query
+from core.sketch import DistinctSketches, QuantileSketches
+from core.stakes import get_live_stakes
+from core.windows import RollingWindows
+
+
+# --- fact_staking ---------------------------------------------------------------------------------------------------
+@cached_loader("fact_staking", max_entries=2)
+def load_staking_daily():
+    """Successful uaxl staking txns per (day, action, delegator), full history."""
+    return run_query("staking_daily")
+
+
+@cached_loader("fact_staking", max_entries=2)
+def load_staking_amounts_daily():
+    """Row counts per (day, action, amount): the mergeable piece for medians."""
+    return run_query("staking_amounts_daily")
+
+
+@cached_resource("fact_staking", max_entries=2)
+def load_staking_amount_sketches():
+    """Per-day quantile sketches of txn amounts, one ``QuantileSketches`` per action."""
+    df = load_staking_amounts_daily()
+    return {action: QuantileSketches(part["Day"], part["Amount"], part["Rows"]) for action, part in df.groupby("Action")}
+
+
+@cached_resource("fact_staking", max_entries=2)
+def load_staker_sketches():
+    """Per-day distinct-delegator sketches, one ``DistinctSketches`` per action."""
+    df = load_staking_daily()
+    return {action: DistinctSketches(part["Day"], part["User"]) for action, part in df.groupby("Action")}
+
+
+@cached_resource("fact_staking", max_entries=2)
+def load_staking_windows():
+    """Trailing-window totals of successful delegations: stake count, volume and distinct stakers."""
+    df = load_staking_daily()
+    df = df[df["Action"] == "delegate"]
+    return RollingWindows(df["Day"], {"Stake Count": df["Txn Count"], "Staking Volume": df["Txn Volume"]},
+                          keys=df["User"])
+
+
+@cached_resource("fact_staking", max_entries=2)
+def load_staker_checkpoints():
+    """Monthly per-delegator balance checkpoints of successful (un)delegations, for as-of net staked."""
+    df = run_query("net_staked_daily")
+    return BalanceCheckpoints(df["Date"], df["User"], df["Balance Change"])
+
+
+@cached_resource("fact_staking", max_entries=2)
+def load_validator_checkpoints():
+    """Monthly per-validator balance checkpoints (redelegations count against their source)."""
+    df = run_query("validator_balances")
+    return BalanceCheckpoints(df["Date"], df["Validator"], df["Balance Change"])
+
+
+@instrumented
+def load_stake_matrices():
+    """Delegator x validator ``StakeMatrix`` at the end of yesterday, and the same with today's events applied.
+
+    Both are carried forward by the process-wide ``LiveStakes`` (see ``core.stakes``) rather than cached per version.
+    """
+    return get_live_stakes().refresh()
+
+
+# --- fact_staking_rewards -------------------------------------------------------------------------------------------
+@cached_loader("fact_staking_rewards", max_entries=2)
+def load_rewards_daily():
+    """Successful reward claims per (day, claimer), full history."""
+    return run_query("rewards_daily")
+
+
+@cached_loader("fact_staking_rewards", max_entries=2)
+def load_reward_amounts_daily():
+    """Row counts per (day, amount): the mergeable piece for medians."""
+    return run_query("reward_amounts_daily")
+
+
+@cached_resource("fact_staking_rewards", max_entries=2)
+def load_reward_amount_sketches():
+    """Per-day quantile sketches of claimed amounts."""
+    df = load_reward_amounts_daily()
+    return QuantileSketches(df["Day"], df["Amount"], df["Rows"])
+
+
+@cached_resource("fact_staking_rewards", max_entries=2)
+def load_claimer_sketches():
+    """Per-day distinct-claimer sketches."""
+    df = load_rewards_daily()
+    return DistinctSketches(df["Day"], df["User"])
+
+
+@cached_resource("fact_staking_rewards", max_entries=2)
+def load_reward_windows():
+    """Trailing-window totals of reward claims: claim count, reward claimed and distinct claimers."""
+    df = load_rewards_daily()
+    return RollingWindows(df["Day"], {"Claim Txns Count": df["Claim Txns Count"], "Reward Claimed": df["Reward Claimed"]},
+                          keys=df["User"])
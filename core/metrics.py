@@ -0,0 +1,222 @@
+"""Per-loader instrumentation: timings, cache outcome, result size and warehouse query ids.
+
+Every ``cached_loader`` is wrapped by ``instrumented``. Each call records:
+- its wall time
+- whether ``st.cache_data`` served it ("hit") or the body ran ("miss")
+- rows and in-memory bytes of the result (misses only, the rows that were
+  actually fetched or computed)
+- the Snowflake query ids issued while it ran
+- the script run it belongs to
+
+The records go to three places:
+- the ``axelar_staking.loaders`` logger, one JSON object per call
+- a bounded in-process buffer behind the hidden sidebar panel
+  (``ops_panel``; open any page with ``?debug=1``)
+- a Prometheus text file rewritten after every script run, for a local
+  scraper such as node_exporter's textfile collector
+
+The panel and the text file also carry the start-up timings of
+``core.bootstrap``.
+
+Settings live in the ``[metrics]`` secrets section: ``textfile`` (path) and
+``debug_panel`` (always show the panel).
+"""
+import collections
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from core.bootstrap import FIRST_PAINT_BUCKETS, last_first_paint, startup_timings
+
+logger = logging.getLogger("axelar_staking.loaders")
+
+METRIC_PREFIX = "axelar_staking"
+DEFAULT_TEXTFILE = ".metrics/axelar_staking.prom"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)   # seconds
+RECENT_CALLS = 5000
+RUNS_KEY = "_metrics_runs"
+
+_active = contextvars.ContextVar("loader_call", default=None)
+_lock = threading.Lock()
+_recent = collections.deque(maxlen=RECENT_CALLS)
+_totals = collections.defaultdict(lambda: {"hit": 0, "miss": 0, "error": 0, "seconds": 0.0, "rows": 0, "bytes": 0,
+                                           "queries": 0, "buckets": [0] * len(LATENCY_BUCKETS)})
+_runs = [0]
+
+
+def _size(result):
+    # (rows, bytes) of the frames in a result; sketches and other objects count as neither.
+    if isinstance(result, pd.DataFrame):
+        return len(result), int(result.memory_usage(deep=True, index=False).sum())
+    if isinstance(result, pd.Series):
+        return len(result), int(result.memory_usage(deep=True, index=False))
+    parts = result.values() if isinstance(result, dict) else result if isinstance(result, (tuple, list)) else ()
+    sizes = [_size(part) for part in parts]
+    return sum(rows for rows, _ in sizes), sum(size for _, size in sizes)
+
+
+def _session():
+    # Loader threads carry the script's context (see core.scheduler); bare calls (e.g. bench) have none.
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return None, None
+    return ctx.session_id, st.session_state.get(RUNS_KEY, 0) + 1
+
+
+def mark_miss():
+    """Called from inside the cached body: the running loader call was not served from the cache."""
+    call = _active.get()
+    if call is not None:
+        call["cache"] = "miss"
+
+
+def note_query(query_id):
+    """Attach a warehouse query id to the running loader call."""
+    call = _active.get()
+    if call is not None and query_id:
+        call["query_ids"].append(query_id)
+
+
+def _record(call):
+    with _lock:
+        _recent.append(call)
+        totals = _totals[call["loader"]]
+        totals["error" if call["error"] else call["cache"]] += 1
+        totals["seconds"] += call["seconds"]
+        totals["rows"] += call["rows"] or 0
+        totals["bytes"] += call["bytes"] or 0
+        totals["queries"] += len(call["query_ids"])
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            totals["buckets"][i] += call["seconds"] <= bound
+    logger.info(json.dumps(call, default=str))
+
+
+def instrumented(func):
+    """Record every call of loader ``func``; see the module docstring for the fields."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        session, run = _session()
+        call = {"loader": func.__name__, "started": time.time(), "seconds": 0.0, "cache": "hit", "rows": None,
+                "bytes": None, "query_ids": [], "session": session, "run": run, "error": None}
+        token = _active.set(call)
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            call["error"] = type(e).__name__
+            raise
+        finally:
+            _active.reset(token)
+            call["seconds"] = time.perf_counter() - started
+            if call["cache"] == "miss" and not call["error"]:
+                call["rows"], call["bytes"] = _size(result)
+            _record(call)
+        return result
+
+    return wrapper
+
+
+# --- Prometheus text file -------------------------------------------------------------------------------------------
+def prometheus_text():
+    """All counters in the Prometheus text exposition format."""
+    p = METRIC_PREFIX
+    lines = [
+        f"# HELP {p}_script_runs_total Page script runs (first loads and reruns).",
+        f"# TYPE {p}_script_runs_total counter",
+        f"{p}_script_runs_total {_runs[0]}",
+        f"# HELP {p}_loader_calls_total Loader calls by cache outcome.",
+        f"# TYPE {p}_loader_calls_total counter",
+    ]
+    with _lock:
+        totals = {loader: {**values, "buckets": list(values["buckets"])} for loader, values in sorted(_totals.items())}
+    for loader, t in totals.items():
+        lines += [f'{p}_loader_calls_total{{loader="{loader}",cache="{outcome}"}} {t[outcome]}' for outcome in ("hit", "miss", "error")]
+    for name, key, kind, text in (("loader_result_rows_total", "rows", "counter", "Rows returned by cache misses."),
+                                  ("loader_result_bytes_total", "bytes", "counter", "In-memory bytes returned by cache misses."),
+                                  ("loader_warehouse_queries_total", "queries", "counter", "Snowflake statements issued.")):
+        lines += [f"# HELP {p}_{name} {text}", f"# TYPE {p}_{name} {kind}"]
+        lines += [f'{p}_{name}{{loader="{loader}"}} {t[key]}' for loader, t in totals.items()]
+    lines += [f"# HELP {p}_loader_seconds Loader wall time.", f"# TYPE {p}_loader_seconds histogram"]
+    for loader, t in totals.items():
+        calls = t["hit"] + t["miss"] + t["error"]
+        lines += [f'{p}_loader_seconds_bucket{{loader="{loader}",le="{bound:g}"}} {count}'
+                  for bound, count in zip(LATENCY_BUCKETS, t["buckets"])]
+        lines += [f'{p}_loader_seconds_bucket{{loader="{loader}",le="+Inf"}} {calls}',
+                  f'{p}_loader_seconds_sum{{loader="{loader}"}} {t["seconds"]:.6f}',
+                  f'{p}_loader_seconds_count{{loader="{loader}"}} {calls}']
+
+    first_paint, imports = startup_timings()
+    if first_paint["cold_start"] is not None:
+        lines += [f"# HELP {p}_cold_start_seconds Process start to the first paint of its first page run.",
+                  f"# TYPE {p}_cold_start_seconds gauge",
+                  f"{p}_cold_start_seconds {first_paint['cold_start']:.6f}"]
+    lines += [f"# HELP {p}_first_paint_seconds Page run start to its title being drawn.",
+              f"# TYPE {p}_first_paint_seconds histogram"]
+    lines += [f'{p}_first_paint_seconds_bucket{{le="{bound:g}"}} {count}' for bound, count in zip(FIRST_PAINT_BUCKETS, first_paint["buckets"])]
+    lines += [f'{p}_first_paint_seconds_bucket{{le="+Inf"}} {first_paint["count"]}',
+              f"{p}_first_paint_seconds_sum {first_paint['sum']:.6f}",
+              f"{p}_first_paint_seconds_count {first_paint['count']}",
+              f"# HELP {p}_import_seconds Import time of lazily imported modules.",
+              f"# TYPE {p}_import_seconds gauge"]
+    lines += [f'{p}_import_seconds{{module="{module}"}} {seconds:.6f}' for module, seconds in sorted(imports.items())]
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path):
+    """Atomically rewrite the Prometheus text file at ``path``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{threading.get_ident()}.tmp")   # sessions may write concurrently
+    tmp.write_text(prometheus_text())
+    os.replace(tmp, path)
+
+
+# --- Debug panel ----------------------------------------------------------------------------------------------------
+def ops_panel():
+    """End-of-run hook for every page: count the run, rewrite the text file and show the hidden panel.
+
+    The panel lists this session's loader calls of the run just finished
+    and, per loader, totals since the process started.
+    """
+    settings = st.secrets.get("metrics", {})
+    st.session_state[RUNS_KEY] = st.session_state.get(RUNS_KEY, 0) + 1
+    with _lock:
+        _runs[0] += 1
+    write_textfile(settings.get("textfile", DEFAULT_TEXTFILE))
+
+    if st.query_params.get("debug") != "1" and not settings.get("debug_panel", False):
+        return
+    session, run = get_script_run_ctx().session_id, st.session_state[RUNS_KEY]
+    with _lock:
+        calls = [call for call in _recent if call["session"] == session and call["run"] == run]
+        totals = {loader: dict(values) for loader, values in _totals.items()}
+
+    with st.sidebar.expander("🔧 Loader Metrics", expanded=True):
+        first_paint, imports = startup_timings()
+        paint = last_first_paint()
+        st.caption(f"Run {run} of this session · {len(calls)} loader calls"
+                   + (f" · first paint {paint * 1e3:.0f} ms" if paint is not None else "")
+                   + (f" · cold start {first_paint['cold_start']:.2f} s" if first_paint["cold_start"] is not None else "")
+                   + "".join(f" · import {module} {seconds * 1e3:.0f} ms" for module, seconds in sorted(imports.items())))
+        df = pd.DataFrame(calls, columns=["loader", "cache", "seconds", "rows", "bytes", "query_ids"])
+        df = df.assign(ms=(df["seconds"] * 1e3).round(1), KB=(pd.to_numeric(df["bytes"]) / 1024).round(1),
+                       query_ids=df["query_ids"].map(", ".join)).sort_values("ms", ascending=False)
+        st.dataframe(df[["loader", "cache", "ms", "rows", "KB", "query_ids"]], hide_index=True, use_container_width=True)
+
+        if not totals:
+            return
+        df_totals = pd.DataFrame.from_dict(totals, orient="index")
+        calls_total = df_totals["hit"] + df_totals["miss"] + df_totals["error"]
+        df_totals = pd.DataFrame({"calls": calls_total, "hit %": (100 * df_totals["hit"] / calls_total).round(1),
+                                  "avg ms": (1e3 * df_totals["seconds"] / calls_total).round(1),
+                                  "errors": df_totals["error"]}).rename_axis("loader").sort_values("avg ms", ascending=False)
+        st.dataframe(df_totals, use_container_width=True)
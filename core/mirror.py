@@ -0,0 +1,213 @@
+"""Local columnar mirror of the append-only staking tables.
+
+``axelar.gov.fact_staking`` and ``axelar.gov.fact_staking_rewards`` only ever
+grow, so instead of scanning them remotely on every page view we keep a local
+copy as month-partitioned Parquet files and query it with DuckDB. Each sync
+pulls only rows newer than the stored ``block_timestamp`` watermark.
+
+Layout::
+
+    <root>/<table>/month=YYYY-MM/part-<watermark>-<n>.parquet
+    <root>/<table>/_watermark.json
+    <root>/_staging/<table>/...      (parts of a sync in progress)
+
+A sync writes its parts to the staging directory and only moves them into
+the table once every chunk has arrived, then saves the watermark. Part
+files are named after the watermark the sync started from: chunk
+boundaries differ between attempts, so a retry first deletes any parts an
+earlier attempt from the same watermark managed to publish.
+
+Run ``python -m core.mirror`` to sync outside the app (e.g. from cron).
+"""
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from core.connection import borrow_connection
+from core.fetch import fetch_batches, query_tag, read_warehouse
+
+# --- Settings (overridable from the [mirror] secrets section) -------------------------------------------------------
+MIRROR_TABLES = {
+    "fact_staking": "axelar.gov.fact_staking",
+    "fact_staking_rewards": "axelar.gov.fact_staking_rewards",
+}
+DEFAULT_MIRROR_DIR = ".mirror"
+DEFAULT_SYNC_INTERVAL = 600     # seconds between incremental syncs
+SYNC_CHUNK_ROWS = 200_000
+
+
+class StakingMirror:
+    """Month-partitioned Parquet copy of the staking tables with a DuckDB front end."""
+
+    def __init__(self, root=DEFAULT_MIRROR_DIR, sync_interval=DEFAULT_SYNC_INTERVAL):
+        import duckdb
+
+        self.root = Path(root)
+        self.sync_interval = sync_interval
+        self._db = duckdb.connect()
+        self._sync_lock = threading.Lock()
+        self._last_sync = 0.0
+        self._register_views()
+
+    # --- Watermarks ---------------------------------------------------------------------------------------------
+    def _table_dir(self, table):
+        return self.root / table
+
+    def _staging_dir(self, table):
+        return self.root / "_staging" / table
+
+    def watermark(self, table):
+        path = self._table_dir(table) / "_watermark.json"
+        if not path.exists():
+            return None
+        return pd.Timestamp(json.loads(path.read_text())["block_timestamp"])
+
+    def _save_watermark(self, table, value):
+        path = self._table_dir(table) / "_watermark.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"block_timestamp": value.isoformat()}))
+        os.replace(tmp, path)
+
+    def is_ready(self):
+        return all(self.watermark(table) is not None for table in MIRROR_TABLES)
+
+    # --- Sync ---------------------------------------------------------------------------------------------------
+    def _write_chunk(self, table, df, token, n):
+        df.columns = [c.lower() for c in df.columns]
+        df["block_timestamp"] = pd.to_datetime(df["block_timestamp"])
+        for month, part in df.groupby(df["block_timestamp"].dt.strftime("%Y-%m")):
+            month_dir = self._staging_dir(table) / f"month={month}"
+            month_dir.mkdir(parents=True, exist_ok=True)
+            part.to_parquet(month_dir / f"part-{token}-{n}.parquet", index=False)
+        return df["block_timestamp"].max()
+
+    def _publish(self, table):
+        staging = self._staging_dir(table)
+        for path in sorted(staging.glob("*/*.parquet")):
+            month_dir = self._table_dir(table) / path.parent.name
+            month_dir.mkdir(parents=True, exist_ok=True)
+            os.replace(path, month_dir / path.name)
+        shutil.rmtree(staging)
+
+    def sync_table(self, conn, table):
+        """Append rows newer than the watermark; returns the number of new rows."""
+        self._table_dir(table).mkdir(parents=True, exist_ok=True)
+        watermark = self.watermark(table)
+        token = "init" if watermark is None else watermark.strftime("%Y%m%dT%H%M%S%f")
+        # Leftovers of an attempt from the same watermark: unpublished, or published before its watermark was saved.
+        shutil.rmtree(self._staging_dir(table), ignore_errors=True)
+        for path in self._table_dir(table).glob(f"*/part-{token}-*.parquet"):
+            path.unlink()
+
+        query = f"select * from {MIRROR_TABLES[table]}"
+        params = None
+        if watermark is not None:
+            query += " where block_timestamp > ?"
+            params = (watermark.to_pydatetime(),)
+        query += " order by block_timestamp, tx_id"
+
+        rows = 0
+        newest = watermark
+        for n, chunk in enumerate(fetch_batches(conn, query, params, batch_rows=SYNC_CHUNK_ROWS,
+                                                  tag=query_tag(f"mirror_sync.{table}"))):
+            if chunk.empty:
+                continue
+            newest = self._write_chunk(table, chunk, token, n)
+            rows += len(chunk)
+
+        if newest is not None and newest != watermark:
+            self._publish(table)
+            self._save_watermark(table, newest)
+        return rows
+
+    def _sync(self):
+        with borrow_connection() as conn:
+            synced = {table: self.sync_table(conn, table) for table in MIRROR_TABLES}
+        self._register_views()
+        self._last_sync = time.monotonic()
+        return synced
+
+    def sync(self):
+        with self._sync_lock:
+            return self._sync()
+
+    def _is_fresh(self):
+        return time.monotonic() - self._last_sync < self.sync_interval
+
+    def ensure_fresh(self):
+        """Sync if the last sync is older than ``sync_interval``.
+
+        Concurrent callers share one sync. Once the mirror holds data, a sync
+        already running in another thread is not waited for and a failed sync
+        is not fatal: readers keep using the rows on disk until the next attempt.
+        """
+        if self._is_fresh():
+            return
+        if self.is_ready() and self._sync_lock.locked():
+            return
+        with self._sync_lock:
+            if self._is_fresh():
+                return
+            try:
+                self._sync()
+            except Exception:
+                self._last_sync = time.monotonic()
+                if not self.is_ready():
+                    raise
+
+    # --- Query --------------------------------------------------------------------------------------------------
+    def _register_views(self):
+        for table in MIRROR_TABLES:
+            if self.watermark(table) is None:
+                continue
+            pattern = (self._table_dir(table) / "*" / "*.parquet").as_posix()
+            self._db.execute(
+                f"create or replace view {table} as "
+                f"select * from read_parquet('{pattern}', hive_partitioning=true, union_by_name=true)"
+            )
+
+    def query(self, query, params=None):
+        """Run warehouse-dialect SQL against the mirror, mapping remote table names to local views."""
+        for table, source in MIRROR_TABLES.items():
+            query = re.sub(re.escape(source) + r"\b", table, query, flags=re.IGNORECASE)
+        return self._db.cursor().execute(query, params).df()
+
+
+@st.cache_resource
+def get_mirror():
+    settings = st.secrets.get("mirror", {})
+    return StakingMirror(
+        root=settings.get("path", DEFAULT_MIRROR_DIR),
+        sync_interval=int(settings.get("sync_interval", DEFAULT_SYNC_INTERVAL)),
+    )
+
+
+def read_mirror(query, params=None, tag=None):
+    """Run ``query`` on the local mirror, falling back to the warehouse if it cannot be synced.
+
+    ``params`` are qmark (``?``) bind values; ``tag`` is the warehouse query tag.
+    """
+    try:
+        mirror = get_mirror()
+    except ImportError:
+        return read_warehouse(query, params, tag=tag)
+    try:
+        mirror.ensure_fresh()
+    except Exception:
+        # The initial sync failed; it is retried after ``sync_interval``, and the warehouse answers meanwhile.
+        pass
+    if not mirror.is_ready():
+        return read_warehouse(query, params, tag=tag)
+    return mirror.query(query, params)
+
+
+if __name__ == "__main__":
+    for table, rows in get_mirror().sync().items():
+        print(f"{table}: {rows:,} new rows")
@@ -0,0 +1,67 @@
+"""Nakamoto coefficient over a daily validator balance matrix.
+
+Validator balances are held as a dense days x validators matrix (a few
+thousand days by a few hundred validators), so the coefficient for every day
+is a handful of array operations instead of a ranked window query per day:
+power transform, sort each row descending, cumulative sum, then count the
+validators needed to reach each threshold.
+"""
+import numpy as np
+import pandas as pd
+
+POWER_FUNCTIONS = {
+    "quadratic": np.sqrt,
+    "linear": lambda balance: balance,
+}
+DEFAULT_THRESHOLD = 33.6
+
+
+def balance_matrix(days, validators, amounts, end=None):
+    """Daily end-of-day balances as a DataFrame indexed by date with one column per validator.
+
+    ``days``/``validators``/``amounts`` are parallel arrays of signed balance
+    changes. Balances are carried forward to ``end`` (default: last change day)
+    and rounded to uaxl precision so that fully undelegated validators read 0.
+    """
+    days = np.asarray(days, dtype="datetime64[D]")
+    codes, labels = pd.factorize(np.asarray(validators), sort=True)
+    amounts = np.asarray(amounts, dtype=np.float64)
+
+    start = days.min()
+    end = days.max() if end is None else max(np.datetime64(end, "D"), start)
+    calendar = np.arange(start, end + np.timedelta64(1, "D"), dtype="datetime64[D]")
+    keep = days <= end
+
+    changes = np.zeros((len(calendar), len(labels)))
+    np.add.at(changes, ((days[keep] - start).astype(np.int64), codes[keep]), amounts[keep])
+    balances = np.round(np.cumsum(changes, axis=0), 6)
+    return pd.DataFrame(balances, index=pd.DatetimeIndex(calendar.astype("datetime64[ns]"), name="Date"),
+                        columns=labels)
+
+
+def nakamoto_coefficients(balances, thresholds=(DEFAULT_THRESHOLD,), power="quadratic"):
+    """Smallest number of validators whose combined power share reaches each threshold, per day.
+
+    ``balances`` is the output of ``balance_matrix``; only validators with a
+    positive balance count. Shares are rounded to two decimals before the
+    comparison, as in the original SQL. Returns a DataFrame with a ``Date``
+    column and one column per threshold; days without any bonded stake are
+    dropped.
+    """
+    values = balances.to_numpy(dtype=np.float64)
+    voting_power = np.where(values > 0, POWER_FUNCTIONS[power](np.clip(values, 0, None)), 0.0)
+
+    ranked = -np.sort(-voting_power, axis=1)
+    cumulative = np.cumsum(ranked, axis=1)
+    total = cumulative[:, -1:]
+    active = total[:, 0] > 0
+    share = np.round(100 * cumulative[active] / total[active], 2)
+
+    # Rows of ``share`` are non-decreasing, so counting the validators below a
+    # threshold is a per-row searchsorted(side="left").
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    coefficients = (share[:, :, None] < thresholds[None, None, :]).sum(axis=1) + 1
+
+    df = pd.DataFrame(coefficients, columns=[float(t) for t in thresholds])
+    df.insert(0, "Date", balances.index[active])
+    return df
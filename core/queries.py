@@ -0,0 +1,225 @@
+"""Named SQL for every query the dashboard runs.
+
+Loaders refer to their SQL by name through ``run_query`` instead of building
+it inline, so a logical query always reaches DuckDB or Snowflake as one
+canonical text. Values are bound with qmark ``?`` placeholders rather than
+formatted into the text, which lets the warehouse reuse its result cache and
+compiled plans across users. Every warehouse statement carries the query tag
+``axelar_staking:<name>`` so it can be traced in ``query_history``.
+"""
+import textwrap
+
+from core.fetch import query_tag, read_warehouse
+from core.mirror import MIRROR_TABLES, read_mirror
+
+# --- Mirror queries ------------------------------------------------------------------------------------------------
+# Only read the mirrored tables and stay within SQL that DuckDB and Snowflake
+# share, so the local mirror answers them when it is synced. Balances are not
+# carried across days in SQL: queries return per-day changes, and balances as
+# of any day come from core.ledger, core.asof and core.stakes.
+MIRROR_QUERIES = {
+    # Shared day-grain loaders (core.loaders)
+    "staking_daily": """
+    select block_timestamp::date as "Day", action as "Action", delegator_address as "User",
+    count(distinct tx_id) as "Txn Count", sum(amount)/pow(10,6) as "Txn Volume",
+    count(*) as "Rows", max(amount)/pow(10,6) as "Maximum"
+    from axelar.gov.fact_staking
+    where tx_succeeded='true' and currency='uaxl'
+    group by 1,2,3
+    """,
+    "staking_amounts_daily": """
+    select block_timestamp::date as "Day", action as "Action", amount/pow(10,6) as "Amount", count(*) as "Rows"
+    from axelar.gov.fact_staking
+    where tx_succeeded='true' and currency='uaxl'
+    group by 1,2,3
+    """,
+    "rewards_daily": """
+    select block_timestamp::date as "Day", delegator_address as "User",
+    count(distinct tx_id) as "Claim Txns Count", sum(amount)/pow(10,6) as "Reward Claimed",
+    count(*) as "Rows", max(amount)/pow(10,6) as "Maximum"
+    from axelar.gov.fact_staking_rewards
+    where tx_succeeded='true'
+    group by 1,2
+    """,
+    "reward_amounts_daily": """
+    select block_timestamp::date as "Day", amount/pow(10,6) as "Amount", count(*) as "Rows"
+    from axelar.gov.fact_staking_rewards
+    where tx_succeeded='true'
+    group by 1,2
+    """,
+    "first_seen_staking_since": """
+    select delegator_address as "User",
+    min(case when action='delegate' and currency='uaxl' then block_timestamp::date end) as "First Stake",
+    min(case when action in ('delegate','undelegate') then block_timestamp::date end) as "Joined",
+    max(block_timestamp::date) as "Last Activity", max(block_timestamp) as "Last Event"
+    from axelar.gov.fact_staking
+    where tx_succeeded='true' and block_timestamp > ?
+    group by 1
+    """,
+    "first_seen_claims_since": """
+    select delegator_address as "User", min(block_timestamp::date) as "First Claim",
+    max(block_timestamp::date) as "Last Activity", max(block_timestamp) as "Last Event"
+    from axelar.gov.fact_staking_rewards
+    where tx_succeeded='true' and block_timestamp > ?
+    group by 1
+    """,
+
+    # Overview
+    # Keyset page over whole txs: (threshold, range start, cursor timestamp x2, cursor tx_id, page size in txs).
+    # One tx can hold several staking rows, so (block_timestamp, tx_id) is not unique per row; pages take
+    # every qualifying row of their txs and the next page starts below the last tx.
+    "whale_events_page": """
+    with whale_events as (
+        select block_timestamp, tx_id, delegator_address, amount, action, validator_address
+        from axelar.gov.fact_staking
+        where tx_succeeded='true' and currency='uaxl' and (amount/pow(10,6))>=?
+        and block_timestamp >= ?
+        and (block_timestamp < ? or (block_timestamp = ? and tx_id < ?))),
+    page_txs as (
+        select distinct block_timestamp, tx_id
+        from whale_events
+        order by block_timestamp desc, tx_id desc
+        limit ?)
+    select e.block_timestamp::date as "📅Date", e.delegator_address as "🐋Staker", e.amount/pow(10,6) as "💰Staking Volume ($AXL)",
+    case when e.action='delegate' then '🟢Stake'
+    when e.action='undelegate' then '🔴Unstake'
+    when e.action='redelegate' then '🟡Restake'
+    end as "Action",
+    e.validator_address as "👩‍💻Validator",
+    e.block_timestamp as "Cursor Timestamp", e.tx_id as "Cursor Tx"
+    from whale_events e
+    join page_txs p on e.block_timestamp = p.block_timestamp and e.tx_id = p.tx_id
+    order by e.block_timestamp desc, e.tx_id desc, e.validator_address, e.delegator_address
+    """,
+
+    # Staking Analysis
+    "net_staked_daily": """
+    select block_timestamp::date as "Date", delegator_address as "User",
+    sum(case when action='undelegate' then -amount else amount end)/1e6 as "Balance Change"
+    from axelar.gov.fact_staking
+    where action in ('delegate','undelegate') and TX_SUCCEEDED=TRUE
+    group by 1,2
+    """,
+    "delegate_txs": """
+    select distinct block_timestamp::date as "Day", tx_id as "Tx", amount/pow(10,6) as "Amount"
+    from axelar.gov.fact_staking
+    where tx_succeeded='true' and currency='uaxl' and action='delegate'
+    """,
+
+    # Validators Analysis
+    "validator_balances": """
+    select block_timestamp::date as "Date", validator as "Validator", sum(amount)/1e6 as "Balance Change"
+    from (
+        select BLOCK_TIMESTAMP, VALIDATOR_ADDRESS as validator,
+        case when action='undelegate' then -amount
+        else amount end as amount
+        from axelar.gov.fact_staking
+        union all
+        select BLOCK_TIMESTAMP, REDELEGATE_SOURCE_VALIDATOR_ADDRESS,
+        -amount
+        from axelar.gov.fact_staking
+        where action='redelegate')
+    group by 1,2
+    """,
+    "delegation_changes_since": """
+    select block_timestamp::date as "Date", delegator as "Delegator", validator as "Validator",
+    sum(amount)/1e6 as "Balance Change", max(block_timestamp) as "Last Event"
+    from (
+        select BLOCK_TIMESTAMP, DELEGATOR_ADDRESS as delegator, VALIDATOR_ADDRESS as validator,
+        case when action='undelegate' then -amount
+        else amount end as amount
+        from axelar.gov.fact_staking
+        union all
+        select BLOCK_TIMESTAMP, DELEGATOR_ADDRESS, REDELEGATE_SOURCE_VALIDATOR_ADDRESS,
+        -amount
+        from axelar.gov.fact_staking
+        where action='redelegate')
+    where block_timestamp > ?
+    group by 1,2,3
+    """,
+    "redelegations_since": """
+    select redelegate_source_validator_address as "Source", validator_address as "Target",
+    sum(amount)/1e6 as "Amount", count(*) as "Redelegations", max(block_timestamp) as "Last Redelegation"
+    from axelar.gov.fact_staking
+    where action='redelegate' and tx_succeeded='true' and block_timestamp > ?
+    group by 1,2
+    """,
+
+    # Reward Analysis
+    "claim_txs": """
+    select min(block_timestamp::date) as "Day", sum(amount)/pow(10,6) as "Amount"
+    from axelar.gov.fact_staking_rewards
+    where tx_succeeded='true'
+    group by tx_id
+    """,
+    "recent_claim_stats": """
+    select block_timestamp as "📅Date",
+    delegator_address as "👨‍💼Claimer",
+    (amount)/pow(10,6) as "💰Reward Volume ($AXL)"
+    from axelar.gov.fact_staking_rewards
+    where tx_succeeded='true' and block_timestamp::date = current_date - 1
+    order by 1 desc
+    """,
+}
+MIRROR_QUERIES.update({
+    f"data_version.{table}": f"""
+    select max(block_timestamp) as "Version"
+    from {source}
+    """
+    for table, source in MIRROR_TABLES.items()
+})
+
+# --- Warehouse queries ---------------------------------------------------------------------------------------------
+# Use tables that are not mirrored or SQL that only Snowflake runs.
+WAREHOUSE_QUERIES = {
+    # Stakers Analysis
+    "top_stakers_by_net_staked_volume": """
+    with axl_stakers_balance as (
+    select * from
+        (select user, sum(amount)/1e6 as balance, min(block_timestamp) as join_date
+        from
+            (
+            select block_timestamp, DELEGATOR_ADDRESS as user, -1* amount as amount, TX_ID as tx_hash
+            from axelar.gov.fact_staking
+            where action='undelegate' and TX_SUCCEEDED=TRUE
+            union all
+            select block_timestamp, DELEGATOR_ADDRESS, amount, TX_ID
+            from axelar.gov.fact_staking
+            where action='delegate' and TX_SUCCEEDED=TRUE)
+        group by 1)
+    where balance>=0.001 and balance is not null),
+    axl_stakers_reward as (
+    select DELEGATOR_ADDRESS as user, sum(amount)/1e6 as reward
+    from axelar.gov.fact_staking_rewards
+    group by 1)
+    select a.user as "User", round(balance,1) as "Staked $AXL", round(reward,1) as "Claimed Reward", join_date as "First Stake"
+    from axl_stakers_balance a
+    left join axl_stakers_reward b
+    on a.user=b.user
+    order by 2 desc
+    limit 1000
+    """,
+
+    # Validators Analysis
+    "validator_labels": """
+    select ADDRESS as "Address", LABEL as "Validator"
+    from axelar.gov.fact_validators
+    """,
+}
+
+
+def _canonical(sql):
+    return "\n".join(line.rstrip() for line in textwrap.dedent(sql).strip("\n").splitlines())
+
+
+MIRROR_QUERIES = {name: _canonical(sql) for name, sql in MIRROR_QUERIES.items()}
+WAREHOUSE_QUERIES = {name: _canonical(sql) for name, sql in WAREHOUSE_QUERIES.items()}
+
+
+def run_query(name, params=None):
+    """Run the registered query ``name`` with qmark ``params`` and return a DataFrame."""
+    if name in MIRROR_QUERIES:
+        return read_mirror(MIRROR_QUERIES[name], params, tag=query_tag(name))
+    if name in WAREHOUSE_QUERIES:
+        return read_warehouse(WAREHOUSE_QUERIES[name], params, tag=query_tag(name))
+    raise KeyError(f"Unknown query: {name!r}")
@@ -0,0 +1,93 @@
+"""Slice and roll up day-grain pieces in pandas.
+
+Loaders fetch one full-history frame at day granularity; every date range
+and every "Select Time Frame" option is derived from it locally. Sums, counts and maxima roll up directly;
+distinct counts roll up from (day, key) pairs and medians from per-day
+(value, weight) pairs, both of which merge exactly across days.
+"""
+import numpy as np
+import pandas as pd
+
+TIMEFRAMES = ["year", "quarter", "month", "week", "day"]
+_PERIOD_FREQ = {"week": "W-SUN", "month": "M", "quarter": "Q", "year": "Y"}
+
+
+def sql_round(values, decimals=0):
+    """Round half away from zero like SQL ``round``; numpy and pandas round half to even."""
+    scale = 10.0 ** decimals
+    return np.sign(values) * np.floor(np.abs(values) * scale + 0.5) / scale
+
+
+def sql_text(values):
+    """Floats as SQL renders them in ``x||'%'``: ``12.5``, ``100`` (no ``.0``, no ``-0``); missing stays ``None``."""
+    return pd.Series(values).map(lambda value: np.format_float_positional(value + 0.0, trim="-")
+                                 if np.isfinite(value) else None)
+
+
+def truncate(dates, timeframe):
+    """Start of the enclosing period, like Snowflake ``date_trunc`` (weeks start on Monday)."""
+    if timeframe not in TIMEFRAMES:
+        raise ValueError(f"timeframe must be one of {TIMEFRAMES}, got {timeframe!r}")
+    dates = pd.to_datetime(pd.Series(dates)).dt.normalize()
+    if timeframe == "day":
+        return dates
+    return dates.dt.to_period(_PERIOD_FREQ[timeframe]).dt.start_time
+
+
+def rollup(df, timeframe, by=(), sums=(), maxes=(), distinct=None, date_col="Day"):
+    """Aggregate day-grain rows to periods.
+
+    ``sums`` and ``maxes`` are column lists; ``distinct`` maps an output name
+    to the key column whose unique values are counted per period. The result
+    has a ``Date`` column (period start) followed by ``by`` and the metrics.
+    """
+    keys = [truncate(df[date_col], timeframe).rename("Date")] + [df[c] for c in by]
+    grouped = df.groupby(keys, sort=True)
+    parts = []
+    if sums:
+        parts.append(grouped[list(sums)].sum())
+    if maxes:
+        parts.append(grouped[list(maxes)].max())
+    for name, column in (distinct or {}).items():
+        parts.append(grouped[column].nunique().rename(name))
+    return pd.concat(parts, axis=1).reset_index()
+
+
+def slice_range(df, start_date, end_date, date_col="Day"):
+    """Rows whose ``date_col`` falls within [start_date, end_date], both inclusive."""
+    dates = pd.to_datetime(df[date_col])
+    return df[(dates >= pd.Timestamp(start_date)) & (dates <= pd.Timestamp(end_date))]
+
+
+def weighted_median(df, value, weight="Rows", by=(), name="Median"):
+    """Exact median of ``value`` repeated ``weight`` times, per ``by`` group.
+
+    Even-sized groups average the two middle values, as Snowflake ``median``
+    does. Without ``by`` the result is a single-row frame.
+    """
+    keys = list(by) or ["_all"]
+    data = pd.DataFrame({value: df[value].to_numpy(), weight: df[weight].to_numpy()})
+    for column in by:
+        data[column] = df[column].to_numpy()
+    if not by:
+        data["_all"] = 0
+    data = data.sort_values(keys + [value], kind="stable").reset_index(drop=True)
+
+    upto = data.groupby(keys, sort=False)[weight].cumsum().to_numpy()
+    before = upto - data[weight].to_numpy()
+    total = data.groupby(keys, sort=False)[weight].transform("sum").to_numpy()
+
+    halves = []
+    for position in ((total - 1) // 2, total // 2):
+        holds = (before <= position) & (position < upto)
+        halves.append(data.loc[holds, keys + [value]].set_index(keys)[value])
+    median = ((halves[0] + halves[1]) / 2).rename(name).reset_index()
+    if by:
+        return median
+    return median.drop(columns="_all") if len(median) else pd.DataFrame({name: [float("nan")]})
+
+
+def rollup_median(df, timeframe, value, weight="Rows", by=(), date_col="Day", name="Median"):
+    """Exact median per period from (day, value, weight) rows."""
+    data = df.assign(Date=truncate(df[date_col], timeframe).to_numpy())
+    return weighted_median(data, value, weight=weight, by=["Date"] + list(by), name=name)
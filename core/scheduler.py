@@ -0,0 +1,36 @@
+"""Run a page's independent loaders concurrently.
+
+Pages used to call their loaders one after another, so the first full
+render took the sum of every query. ``load_concurrently`` submits them to a
+thread pool at the top of the page and returns once all have finished, so
+the first full render takes as long as the slowest loader.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def load_concurrently(*calls, max_workers=DEFAULT_MAX_WORKERS, message="⏳Loading on-chain data..."):
+    """Run ``(loader, *args)`` calls in parallel and return their results in call order.
+
+    Worker threads are attached to the current script run, so cached loaders
+    behave exactly as they do on the main thread. If loaders fail, the
+    exception of the first failing call in call order is re-raised here,
+    after every call has finished. No calls return an empty tuple.
+    """
+    if not calls:
+        return ()
+    ctx = get_script_run_ctx()
+
+    def run(loader, args):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return loader(*args)
+
+    with st.spinner(message):
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as pool:
+            futures = [pool.submit(run, call[0], call[1:]) for call in calls]
+            return tuple(future.result() for future in futures)
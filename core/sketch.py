@@ -0,0 +1,217 @@
+"""Mergeable per-day sketches: distinct counts (HyperLogLog) and quantiles (DDSketch).
+
+Distinct counts do not add up across days, so "unique stakers between two
+dates" used to need every (day, address) row of the range. ``DistinctSketches``
+keeps one HyperLogLog register array per day instead. The element-wise max of
+the days in a range is the sketch of their union, so any range (or every
+period of a time frame) is answered from the per-day store.
+
+With ``precision`` p there are m = 2**p one-byte registers per day and the
+estimate has a relative standard error of about 1.04 / sqrt(m): 1.6% for the
+default p = 12 (about 4 KB per day), so 95% of estimates fall within 3.3%.
+Ranges holding at most ``exact_max_rows`` (day, key) rows are counted
+exactly from the key codes kept next to the registers; these cover most
+day- and week-sized queries.
+
+``QuantileSketches`` does the same for percentiles of an amount: per-day
+log-bucket histograms that add up over any range, with a relative error of
+``relative_accuracy`` (1% by default) on every quantile.
+"""
+import numpy as np
+import pandas as pd
+
+from core.rollup import truncate
+
+DEFAULT_PRECISION = 12
+DEFAULT_EXACT_MAX_ROWS = 50_000
+
+
+def relative_error(precision=DEFAULT_PRECISION):
+    """Relative standard error of a HyperLogLog estimate with ``2**precision`` registers."""
+    return 1.04 / np.sqrt(2 ** precision)
+
+
+def _sigma(x):
+    if x == 1:
+        return np.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous, z = z, z + x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _tau(x):
+    if x in (0, 1):
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = np.sqrt(x)
+        previous = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+def _hll_estimate(registers, precision):
+    """Ertl's improved estimator: unbiased across the whole range without empirical bias tables."""
+    m = registers.size
+    q = 64 - precision
+    histogram = np.bincount(registers, minlength=q + 2)
+    z = m * _tau(1 - histogram[q + 1] / m)
+    for k in range(q, 0, -1):
+        z = 0.5 * (z + histogram[k])
+    z += m * _sigma(histogram[0] / m)
+    return int(round(m * m / (2 * np.log(2) * z)))
+
+
+class DistinctSketches:
+    """Per-day HyperLogLog registers for one key column, with an exact path for small ranges."""
+
+    def __init__(self, days, keys, precision=DEFAULT_PRECISION, exact_max_rows=DEFAULT_EXACT_MAX_ROWS):
+        days = np.asarray(pd.to_datetime(pd.Series(days)).dt.normalize(), dtype="datetime64[D]")
+        keys = np.asarray(keys, dtype=object)
+        order = np.argsort(days, kind="stable")
+        days, keys = days[order], keys[order]
+
+        self.precision = precision
+        self.exact_max_rows = exact_max_rows
+        self.start = days[0] if len(days) else np.datetime64("today", "D")
+        self.size = int((days[-1] - self.start).astype(int)) + 1 if len(days) else 0
+        self._day_index = (days - self.start).astype(np.int64)
+        self._codes = pd.factorize(keys)[0]
+
+        hashes = pd.util.hash_array(keys)
+        tail_bits = 64 - precision
+        register = (hashes >> np.uint64(tail_bits)).astype(np.int64)
+        tail = hashes & np.uint64((1 << tail_bits) - 1)
+        # rank = position of the leftmost 1-bit in the tail; frexp's exponent is its bit length.
+        rank = (tail_bits + 1 - np.frexp(tail.astype(np.float64))[1]).astype(np.uint8)
+        self._registers = np.zeros((self.size, 2 ** precision), dtype=np.uint8)
+        np.maximum.at(self._registers, (self._day_index, register), rank)
+
+    def _position(self, day, default):
+        if day is None:
+            return default
+        return int(np.clip((np.datetime64(pd.Timestamp(day), "D") - self.start).astype(int), 0, self.size))
+
+    def _count(self, low, high):
+        if low >= high:
+            return 0
+        first, last = np.searchsorted(self._day_index, [low, high])
+        if last - first <= self.exact_max_rows:
+            return int(np.unique(self._codes[first:last]).size)
+        return _hll_estimate(self._registers[low:high].max(axis=0), self.precision)
+
+    def count(self, start_date=None, end_date=None):
+        """Distinct keys seen from ``start_date`` to ``end_date`` inclusive (``None`` is open-ended)."""
+        low = self._position(start_date, 0)
+        high = self._position(None if end_date is None else pd.Timestamp(end_date) + pd.Timedelta(days=1), self.size)
+        return self._count(low, high)
+
+    def count_by_period(self, timeframe, start_date=None, end_date=None, name="Count"):
+        """Distinct keys per ``timeframe`` period within the range, as ``Date`` and ``name`` columns.
+
+        Periods cut by the range only count their days inside it; periods
+        without any key are dropped, like groups in ``core.rollup.rollup``.
+        """
+        low = self._position(start_date, 0)
+        high = self._position(None if end_date is None else pd.Timestamp(end_date) + pd.Timedelta(days=1), self.size)
+        if low >= high:
+            return pd.DataFrame({"Date": pd.Series(dtype="datetime64[ns]"), name: pd.Series(dtype="int64")})
+
+        calendar = self.start + np.arange(low, high)
+        periods = truncate(calendar, timeframe).to_numpy()
+        starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+        bounds = np.r_[starts, len(periods)] + low
+        counts = [self._count(a, b) for a, b in zip(bounds[:-1], bounds[1:])]
+        df = pd.DataFrame({"Date": periods[starts], name: np.asarray(counts, dtype=np.int64)})
+        return df[df[name] > 0].reset_index(drop=True)
+
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+
+class QuantileSketches:
+    """Per-day log-bucket histograms of a positive value (DDSketch), mergeable over any range.
+
+    A value x is counted in bucket ``ceil(log(x) / log(gamma))`` with
+    ``gamma = (1 + a) / (1 - a)``; every quantile read back is within a
+    relative error ``a`` (``relative_accuracy``) of the true one, however
+    many days are merged. Days keep only their non-empty buckets, and a
+    range is merged by adding bucket counts.
+    """
+
+    def __init__(self, days, values, weights=None, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        days = np.asarray(pd.to_datetime(pd.Series(days)).dt.normalize(), dtype="datetime64[D]")
+        values = np.asarray(values, dtype=np.float64)
+        weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=np.float64)
+
+        self.relative_accuracy = relative_accuracy
+        self._log_gamma = np.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self.start = days.min() if len(days) else np.datetime64("today", "D")
+        self.size = int((days.max() - self.start).astype(int)) + 1 if len(days) else 0
+
+        # Bucket 0 holds zeros; positive values start at bucket 1.
+        positive = values > 0
+        index = np.zeros(len(values), dtype=np.int64)
+        index[positive] = np.ceil(np.log(values[positive]) / self._log_gamma).astype(np.int64)
+        self._offset = index[positive].min() - 1 if positive.any() else 0
+        index[positive] -= self._offset
+
+        day_index = (days - self.start).astype(np.int64)
+        df = pd.DataFrame({"day": day_index, "bucket": index, "count": weights})
+        df = df.groupby(["day", "bucket"], sort=True)["count"].sum().reset_index()
+        self._day = df["day"].to_numpy()
+        self._bucket = df["bucket"].to_numpy()
+        self._count = df["count"].to_numpy()
+        self._buckets = int(self._bucket.max()) + 1 if len(df) else 1
+
+    def _value(self, bucket):
+        exponent = np.asarray(bucket, dtype=np.float64) + self._offset
+        value = 2 * np.exp(exponent * self._log_gamma) / (1 + np.exp(self._log_gamma))
+        return np.where(np.asarray(bucket) == 0, 0.0, value)
+
+    def _position(self, day, default):
+        if day is None:
+            return default
+        return int(np.clip((np.datetime64(pd.Timestamp(day), "D") - self.start).astype(int), 0, self.size))
+
+    def _quantiles(self, low, high, quantiles):
+        first, last = np.searchsorted(self._day, [low, high])
+        counts = np.bincount(self._bucket[first:last], weights=self._count[first:last], minlength=self._buckets)
+        total = counts.sum()
+        if total == 0:
+            return np.full(len(quantiles), np.nan)
+        ranks = np.asarray(quantiles, dtype=np.float64) * (total - 1)
+        return self._value(np.searchsorted(np.cumsum(counts), ranks, side="right"))
+
+    def quantiles(self, quantiles, start_date=None, end_date=None):
+        """Estimates of ``quantiles`` (fractions in [0, 1]) from ``start_date`` to ``end_date`` inclusive."""
+        low = self._position(start_date, 0)
+        high = self._position(None if end_date is None else pd.Timestamp(end_date) + pd.Timedelta(days=1), self.size)
+        return self._quantiles(low, high, quantiles)
+
+    def quantiles_by_period(self, timeframe, quantiles, start_date=None, end_date=None, names=None):
+        """One row per ``timeframe`` period with a ``Date`` column and one column per quantile.
+
+        Columns are named ``names`` or ``P10``/``P50``/... by default; periods
+        without values are dropped.
+        """
+        names = names or [f"P{100 * q:g}" for q in quantiles]
+        low = self._position(start_date, 0)
+        high = self._position(None if end_date is None else pd.Timestamp(end_date) + pd.Timedelta(days=1), self.size)
+        if low >= high:
+            return pd.DataFrame(columns=["Date", *names])
+
+        calendar = self.start + np.arange(low, high)
+        periods = truncate(calendar, timeframe).to_numpy()
+        starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+        bounds = np.r_[starts, len(periods)] + low
+        rows = [self._quantiles(a, b, quantiles) for a, b in zip(bounds[:-1], bounds[1:])]
+        df = pd.DataFrame(rows, columns=names)
+        df.insert(0, "Date", periods[starts])
+        return df.dropna(subset=names).reset_index(drop=True)
@@ -0,0 +1,234 @@
+"""Precomputed snapshots of the input-free heavy loaders.
+
+Some results take no user input and are the most expensive in the app:
+- the validator balance matrix behind the Nakamoto chart
+- the active validators list
+- the all-time top stakers
+- the daily net-staked series
+
+After every restart they were recomputed by the first visitor. A batch job
+(``python -m core.snapshots``, from cron or with ``--every``) builds them
+headlessly. Each one is written as a versioned Parquet file, and then the
+manifest is updated. Pages read the latest version through
+``latest_or_build`` and only compute live when no snapshot exists, when
+the data it was built from is more than ``max_lag_hours`` behind the
+current data version (the batch job has stopped), or when it is older than
+the optional ``max_age_hours``.
+
+Layout::
+
+    <root>/<name>/<version>.parquet
+    <root>/manifest.json
+
+The manifest is replaced atomically after its file is in place, and the
+last ``keep`` versions of each snapshot are kept, so a reader holding an
+older manifest still finds its file.
+"""
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core.cache import data_version
+from core.ledger import net_staked_series
+from core.loaders import load_stake_matrices, load_validator_checkpoints
+from core.nakamoto import balance_matrix
+from core.queries import run_query
+from core.rollup import sql_round, sql_text
+from core.stakes import sum_at_least
+
+# --- Settings (overridable from the [snapshots] secrets section) ----------------------------------------------------
+DEFAULT_SNAPSHOT_DIR = ".snapshots"
+DEFAULT_KEEP = 3
+DEFAULT_MAX_LAG_HOURS = 6
+SNAPSHOT_SOURCES = ("fact_staking", "fact_staking_rewards")
+
+
+# --- Builders -------------------------------------------------------------------------------------------------------
+ACTIVE_VALIDATORS = 75   # rows of the active validators list
+
+
+def build_validator_balances():
+    """Daily validator balance matrix (dates x validators) up to today."""
+    df_changes = run_query("validator_balances")
+    return balance_matrix(df_changes["Date"], df_changes["Validator"], df_changes["Balance Change"], end=pd.Timestamp.today())
+
+
+def build_net_staked_daily():
+    """Total net staked $AXL per day up to today."""
+    df_events = run_query("net_staked_daily")
+    df = net_staked_series(df_events["Date"], df_events["User"], df_events["Balance Change"], end=pd.Timestamp.today())
+    df["Net Staked"] = sql_round(df["Net Staked"]).astype("int64")
+    return df[["Date", "Net Staked"]]
+
+
+def build_active_validators_list(limit=ACTIVE_VALIDATORS):
+    """Top validators by yesterday's stake, reduced from the delegator x validator stake matrix.
+
+    As in the original SQL, cumulative shares are of today's total stake,
+    stakers count every positive stake up to now, and the 30-day change is
+    against the balance 31 days ago (from the validator balance checkpoints).
+    """
+    settled, current = load_stake_matrices()
+    staked = settled.validator_totals()
+    staked = staked[staked > 0]
+    total = current.validator_totals()
+    total = total[total > 0]
+    stakers = current.stakers()
+
+    df = pd.DataFrame({"Address": staked.index, "Staked": staked.to_numpy(), "Power": np.sqrt(staked.to_numpy())})
+    df["Share"] = sql_round(100 * sum_at_least(df["Staked"]) / total.sum(), 2)
+    df["Q Share"] = sql_round(100 * sum_at_least(df["Power"]) / np.sqrt(total).sum(), 2)
+    df = df[df["Address"].map(stakers) > 0]
+    df["Staked Amount"] = sql_round(df["Staked"], 2)
+    df = df.sort_values("Staked Amount", ascending=False, kind="stable").head(limit).reset_index(drop=True)
+
+    before = df["Address"].map(load_validator_checkpoints().as_of(pd.Timestamp.today() - pd.Timedelta(days=31)))
+    change = sql_round(100 * (df["Staked"] - before) / before.where(before != 0), 2)
+    # An address can carry several labels; ``map`` needs a unique index, so keep the first.
+    labels = run_query("validator_labels").drop_duplicates("Address").set_index("Address")["Validator"]
+    return pd.DataFrame({
+        "Validator": df["Address"].map(labels),
+        "Staked Amount": df["Staked Amount"],
+        "30D Change %": np.sign(change).map({-1.0: "🟥 ", 1.0: "🟩 ", 0.0: ""}) + sql_text(change) + "%",
+        "Voting Power (Quadratic)": sql_round(df["Power"], 2),
+        "Stakers": df["Address"].map(stakers),
+        "Cumulative Stake %": sql_text(df["Share"]) + "%",
+        "Q Cumulative Stake %": sql_text(df["Q Share"]) + "%",
+        "Address": df["Address"],
+    })
+
+
+SNAPSHOTS = {
+    "validator_balances": build_validator_balances,
+    "active_validators_list": build_active_validators_list,
+    "top_stakers_by_net_staked_volume": lambda: run_query("top_stakers_by_net_staked_volume"),
+    "net_staked_daily": build_net_staked_daily,
+}
+
+
+# --- Store ----------------------------------------------------------------------------------------------------------
+class SnapshotStore:
+    """Versioned Parquet snapshots under ``root`` with a JSON manifest of the latest version of each.
+
+    Versions older than ``max_age`` (a Timedelta, default unlimited) are not
+    served; ``latest_or_build`` also skips those whose data lags the current
+    data version by more than ``max_lag``.
+    """
+
+    def __init__(self, root=DEFAULT_SNAPSHOT_DIR, keep=DEFAULT_KEEP, max_age=None,
+                 max_lag=pd.Timedelta(hours=DEFAULT_MAX_LAG_HOURS)):
+        self.root = Path(root)
+        self.keep = keep
+        self.max_age = max_age
+        self.max_lag = max_lag
+
+    def manifest(self):
+        path = self.root / "manifest.json"
+        if not path.exists():
+            return {}
+        return json.loads(path.read_text())
+
+    def _save_manifest(self, manifest):
+        path = self.root / "manifest.json"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+        os.replace(tmp, path)
+
+    def write(self, name, df, **info):
+        """Store ``df`` as a new version of ``name`` and point the manifest at it; returns its entry."""
+        version = pd.Timestamp.now(tz="UTC").strftime("%Y%m%dT%H%M%S%fZ")
+        snapshot_dir = self.root / name
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        path = snapshot_dir / f"{version}.parquet"
+        tmp = path.with_suffix(".tmp")
+        df.to_parquet(tmp)
+        os.replace(tmp, path)
+
+        entry = {"version": version, "path": path.relative_to(self.root).as_posix(), "rows": len(df),
+                 "created_at": pd.Timestamp.now(tz="UTC").isoformat(), **info}
+        manifest = self.manifest()
+        manifest[name] = entry
+        self._save_manifest(manifest)
+
+        for old in sorted(snapshot_dir.glob("*.parquet"))[:-self.keep]:
+            old.unlink()
+        return entry
+
+    def latest(self, name):
+        """``(DataFrame, manifest entry)`` of the newest servable version of ``name``, or ``None``."""
+        entry = self.manifest().get(name)
+        if entry is None:
+            return None
+        if self.max_age is not None and pd.Timestamp.now(tz="UTC") - pd.Timestamp(entry["created_at"]) > self.max_age:
+            return None
+        try:
+            return pd.read_parquet(self.root / entry["path"]), entry
+        except FileNotFoundError:
+            return None
+
+
+@st.cache_resource
+def get_snapshot_store():
+    settings = st.secrets.get("snapshots", {})
+    max_age_hours = settings.get("max_age_hours")
+    return SnapshotStore(
+        root=settings.get("path", DEFAULT_SNAPSHOT_DIR),
+        keep=int(settings.get("keep", DEFAULT_KEEP)),
+        max_age=None if max_age_hours is None else pd.Timedelta(hours=float(max_age_hours)),
+        max_lag=pd.Timedelta(hours=float(settings.get("max_lag_hours", DEFAULT_MAX_LAG_HOURS))),
+    )
+
+
+def data_lag(entry):
+    """How far the data behind manifest ``entry`` is behind the current data version (worst source)."""
+    built = entry.get("data_versions", {})
+    lag = pd.Timedelta(0)
+    for source in SNAPSHOT_SOURCES:
+        if source not in built:
+            return pd.Timedelta.max
+        behind = pd.Timestamp(data_version(source)) - pd.Timestamp(built[source])
+        if not pd.isna(behind):
+            lag = max(lag, behind)
+    return lag
+
+
+def latest_or_build(name):
+    """The latest snapshot of ``name``, or the live result of its builder when there is none or it is stale."""
+    store = get_snapshot_store()
+    latest = store.latest(name)
+    if latest is not None and data_lag(latest[1]) <= store.max_lag:
+        return latest[0]
+    return SNAPSHOTS[name]()
+
+
+def build_snapshots(store, names=None):
+    """Build and store every snapshot in ``names`` (default: all); returns their manifest entries."""
+    versions = {source: data_version(source) for source in SNAPSHOT_SOURCES}
+    entries = {}
+    for name in names or SNAPSHOTS:
+        started = time.perf_counter()
+        df = SNAPSHOTS[name]()
+        entries[name] = store.write(name, df, seconds=round(time.perf_counter() - started, 3), data_versions=versions)
+    return entries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the precomputed snapshots read by the pages.")
+    parser.add_argument("names", nargs="*", help=f"snapshots to build (default: all of {', '.join(SNAPSHOTS)})")
+    parser.add_argument("--every", type=float, help="keep running, rebuilding every this many seconds")
+    args = parser.parse_args()
+    if unknown := sorted(set(args.names) - set(SNAPSHOTS)):
+        parser.error(f"unknown snapshots: {', '.join(unknown)}")
+
+    while True:
+        for name, entry in build_snapshots(get_snapshot_store(), args.names).items():
+            print(f"{name}: {entry['rows']:,} rows in {entry['seconds']:.1f}s -> {entry['path']}")
+        if not args.every:
+            break
+        time.sleep(args.every)
@@ -0,0 +1,156 @@
+"""Sparse delegator x validator stake matrix.
+
+The active validators list used to aggregate every (delegator, validator)
+pair of ``fact_staking`` in the warehouse to count stakers, then make a
+second pass over the table for the validator balances. ``StakeMatrix``
+holds the net stake of every pair once, in CSR form over interned ids:
+- one row per validator, so every per-validator reduction is a
+  ``bincount`` or a contiguous slice
+- one column per delegator
+- stakes are rounded to uaxl precision (6 decimals) and pairs that net
+  to zero are dropped, so a fully exited delegator is not left holding
+  float residue
+
+Staker counts, validator totals, voting power and cumulative shares are
+then reductions over ``data``. New delegate/undelegate/redelegate
+events are merged with ``apply`` in O(pairs + events), without
+re-reading the history.
+
+One ``LiveStakes`` per process (``get_live_stakes``) carries the matrices
+forward. ``refresh`` reads only the delegation changes after its
+``block_timestamp`` watermark, folds those from before today into the
+settled matrix and applies today's on top of it, so a new data version
+costs the new events and a new day costs no query at all.
+"""
+import copy
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core.cache import data_version
+from core.metrics import mark_miss
+from core.queries import run_query
+
+EPOCH = pd.Timestamp("1970-01-01")
+CHANGE_COLUMNS = ["Date", "Delegator", "Validator", "Balance Change"]
+
+
+def _intern(labels, values):
+    # Append unseen values to ``labels`` (known ids keep their position); returns the labels and the ids of ``values``.
+    codes, uniques = pd.factorize(pd.Series(values))
+    ids, interned = pd.factorize(np.concatenate([labels, np.asarray(uniques, dtype=object)]))
+    return interned, ids[len(labels):][codes]
+
+
+def sum_at_least(values):
+    """``sum(x) over (order by x desc)`` per value: ties share the running total of their last peer, as in SQL."""
+    values = np.asarray(values, dtype=np.float64)
+    ordered = np.sort(values)
+    suffix = np.concatenate([np.cumsum(ordered[::-1])[::-1], [0.0]])
+    return suffix[np.searchsorted(ordered, values)]
+
+
+class StakeMatrix:
+    """Net stake per (validator, delegator) pair in CSR form.
+
+    ``delegators``/``validators``/``amounts`` are parallel arrays of signed
+    stake changes (a redelegation is a negative change on its source).
+    """
+
+    def __init__(self, delegators, validators, amounts):
+        self.validators = np.zeros(0, dtype=object)
+        self.delegators = np.zeros(0, dtype=object)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int64)
+        self.data = np.zeros(0)
+        self._add(delegators, validators, amounts)
+
+    def _add(self, delegators, validators, amounts):
+        held = self._row_ids()
+        self.delegators, columns = _intern(self.delegators, delegators)
+        self.validators, rows = _intern(self.validators, validators)
+        rows = np.concatenate([held, rows])
+        columns = np.concatenate([self.indices, columns])
+        amounts = np.concatenate([self.data, np.asarray(amounts, dtype=np.float64)])
+
+        keys, pair = np.unique(rows * len(self.delegators) + columns, return_inverse=True)
+        stake = np.round(np.bincount(pair, weights=amounts, minlength=len(keys)), 6)
+        keep = stake != 0
+        keys, self.data = keys[keep], stake[keep]
+        rows, self.indices = np.divmod(keys, max(len(self.delegators), 1))
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=len(self.validators)))])
+
+    def _row_ids(self):
+        return np.repeat(np.arange(len(self.validators)), np.diff(self.indptr))
+
+    def apply(self, delegators, validators, amounts):
+        """A new matrix with these signed stake changes merged in (this one is left as it is)."""
+        updated = copy.copy(self)
+        updated._add(delegators, validators, amounts)
+        return updated
+
+    def validator_totals(self):
+        """Validator -> total stake (the validator's balance)."""
+        return pd.Series(np.bincount(self._row_ids(), weights=self.data, minlength=len(self.validators)),
+                         index=self.validators)
+
+    def stakers(self):
+        """Validator -> number of delegators with a positive stake on it."""
+        return pd.Series(np.bincount(self._row_ids()[self.data > 0], minlength=len(self.validators)),
+                         index=self.validators)
+
+    def top_delegators(self, validator, n=10):
+        """The ``n`` largest positive stakes on ``validator`` as a ``Delegator``/``Stake`` DataFrame."""
+        row = np.flatnonzero(self.validators == validator)
+        low, high = (self.indptr[row[0]], self.indptr[row[0] + 1]) if len(row) else (0, 0)
+        stake, columns = self.data[low:high], self.indices[low:high]
+        order = np.argsort(-stake, kind="stable")[:n]
+        order = order[stake[order] > 0]
+        return pd.DataFrame({"Delegator": self.delegators[columns[order]], "Stake": stake[order]})
+
+
+class LiveStakes:
+    """The stake matrix at the end of yesterday and with today's changes applied, updated incrementally."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.settled = StakeMatrix([], [], [])
+        self.current = self.settled
+        self._today = pd.DataFrame(columns=CHANGE_COLUMNS)   # changes from ``day`` on, not yet settled
+        self.day = None
+        self.watermark = None
+        self.data_version = None
+
+    def refresh(self, today=None):
+        """Fold in the changes newer than the watermark and roll over to ``today``; returns ``(settled, current)``."""
+        today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today).normalize()
+        with self._lock:
+            current = data_version("fact_staking")
+            if current == self.data_version and today == self.day:
+                return self.settled, self.current
+            mark_miss()
+            pending = self._today
+            if current != self.data_version:
+                since = self.watermark if self.watermark is not None else EPOCH
+                # Bind parameters carry microseconds; rounding up keeps a nanosecond watermark itself excluded.
+                df = run_query("delegation_changes_since", (since.ceil("us").to_pydatetime(),))
+                if len(df):
+                    self.watermark = pd.Timestamp(df["Last Event"].max())
+                    pending = pd.concat([part for part in (pending, df[CHANGE_COLUMNS]) if len(part)], ignore_index=True)
+                self.data_version = current
+
+            done = pd.to_datetime(pending["Date"]) < today
+            if done.any():
+                settled = pending[done]
+                self.settled = self.settled.apply(settled["Delegator"], settled["Validator"], settled["Balance Change"])
+            self._today = pending[~done]
+            self.current = self.settled.apply(self._today["Delegator"], self._today["Validator"], self._today["Balance Change"])
+            self.day = today
+            return self.settled, self.current
+
+
+@st.cache_resource
+def get_live_stakes():
+    return LiveStakes()
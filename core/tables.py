@@ -0,0 +1,78 @@
+"""Typed table rendering for the dashboard's ranked tables.
+
+The tables used to be formatted with ``df.applymap(lambda x: f"{x:,}")``:
+one Python call per cell, and every number turned into a string that sorted
+as text. ``show_table`` leaves the frame's dtypes alone and describes the
+display per column instead (thousands separators, date format, shortened
+addresses), which the browser applies. ``st.dataframe`` draws only the rows
+in view, and a fixed ``height`` keeps it a scrolling grid, so a 1000-row
+table renders like a 50-row one.
+"""
+import pandas as pd
+import streamlit as st
+
+DEFAULT_HEIGHT = 420   # px, about 12 rows
+DATE_FORMAT = "YYYY-MM-DD"
+DATETIME_FORMAT = "YYYY-MM-DD HH:mm:ss"
+ADDRESS_HEAD, ADDRESS_TAIL = 12, 6
+
+
+def short_address(addresses):
+    """``axelar1abcd…wxyz`` for every address in ``addresses`` (a Series); short ones are kept."""
+    addresses = addresses.astype("string")
+    long = addresses.str.len() > ADDRESS_HEAD + ADDRESS_TAIL + 1
+    return addresses.where(~long, addresses.str[:ADDRESS_HEAD] + "…" + addresses.str[-ADDRESS_TAIL:])
+
+
+def _is_dates(column):
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return True
+    # ``::date`` results arrive as datetime.date objects.
+    first = column.dropna().head(1)
+    return column.dtype == object and len(first) > 0 and type(first.iloc[0]).__name__ == "date"
+
+
+def _has_time(column):
+    # Timestamps with any non-midnight value; ``::date`` values are all midnight (or plain dates).
+    if not pd.api.types.is_datetime64_any_dtype(column):
+        return False
+    values = column.dropna()
+    return bool((values != values.dt.normalize()).any())
+
+
+def column_config(df, addresses=(), overrides=None):
+    """``st.column_config`` for every column of ``df``, chosen from its dtype.
+
+    Numbers get thousands separators, dates ``DATE_FORMAT`` (timestamps with
+    a time of day ``DATETIME_FORMAT``), and the columns named in
+    ``addresses`` are shown shortened (see ``short_address``).
+    ``overrides`` maps column names to configs that replace the default.
+    """
+    config = {}
+    for name in df.columns:
+        column = df[name]
+        if name in addresses:
+            config[name] = st.column_config.TextColumn(name)
+        elif pd.api.types.is_bool_dtype(column):
+            continue
+        elif pd.api.types.is_numeric_dtype(column):
+            config[name] = st.column_config.NumberColumn(name, format="localized")
+        elif _has_time(column):
+            config[name] = st.column_config.DatetimeColumn(name, format=DATETIME_FORMAT)
+        elif _is_dates(column):
+            config[name] = st.column_config.DateColumn(name, format=DATE_FORMAT)
+    config.update(overrides or {})
+    return config
+
+
+def show_table(df, addresses=(), overrides=None, height=DEFAULT_HEIGHT, drop=()):
+    """Render ``df`` with a 1-based row number, typed column formats and a fixed height.
+
+    ``drop`` names columns kept in the frame (e.g. pagination keys) but not shown.
+    """
+    df = df.drop(columns=list(drop))
+    if addresses:
+        df = df.assign(**{name: short_address(df[name]) for name in addresses})
+    df = df.set_axis(pd.RangeIndex(1, len(df) + 1))
+    st.dataframe(df, column_config=column_config(df, addresses, overrides),
+                 height=height if len(df) > 10 else "auto", use_container_width=True)
@@ -0,0 +1,92 @@
+"""Trailing-window KPIs (24h/7d/30d/1y/...) from one per-day series.
+
+``RollingWindows`` keeps a prefix sum over a dense calendar for every
+additive metric, so the total over any day range is two lookups. Distinct
+keys (stakers, claimers) do not add up across days; for them it keeps each
+key's activity days and, once per window end, the number of keys whose
+latest activity up to that end falls on each day. A suffix sum over that
+count then gives the distinct keys for every window start with one lookup.
+
+Windows are day offsets back from ``today``, both inclusive, matching the
+original SQL: "24h" is yesterday only, "7d" is ``current_date-6`` onwards.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+WINDOWS = {
+    "24h": (1, 1),
+    "7d": (6, 0),
+    "30d": (29, 0),
+    "1y": (364, 0),
+}
+
+
+def window_offsets(label):
+    """``(first, last)`` day offsets back from today for ``label``; any ``"<n>d"`` is a custom window."""
+    if label in WINDOWS:
+        return WINDOWS[label]
+    match = re.fullmatch(r"(\d+)d", label)
+    if not match or int(match.group(1)) < 1:
+        raise ValueError(f"window must be one of {list(WINDOWS)} or '<n>d', got {label!r}")
+    return int(match.group(1)) - 1, 0
+
+
+class RollingWindows:
+    """Prefix sums of per-day metrics and per-key activity, answering any day range in O(1)."""
+
+    def __init__(self, days, sums, keys=None):
+        days = np.asarray(pd.to_datetime(pd.Series(days)).dt.normalize(), dtype="datetime64[D]")
+        self.start = days.min() if len(days) else np.datetime64("today", "D")
+        self.size = int((days.max() - self.start).astype(int)) + 1 if len(days) else 0
+        self._index = (days - self.start).astype(np.int64)
+
+        self._prefix = {}
+        for name, values in sums.items():
+            values = np.asarray(values)
+            per_day = np.bincount(self._index, weights=values.astype(np.float64), minlength=self.size)
+            if np.issubdtype(values.dtype, np.integer):
+                per_day = per_day.astype(np.int64)
+            self._prefix[name] = np.concatenate([[0], np.cumsum(per_day)])
+
+        self._keys = None if keys is None else pd.factorize(np.asarray(keys))[0]
+        self._latest = {}
+
+    def _position(self, day):
+        return int(np.clip((np.datetime64(day, "D") - self.start).astype(int), 0, self.size))
+
+    def _bounds(self, first, last):
+        return self._position(first), self._position(last + np.timedelta64(1, "D"))
+
+    def total(self, name, first, last):
+        """Sum of ``name`` over days ``first``..``last``."""
+        low, high = self._bounds(first, last)
+        return self._prefix[name][high] - self._prefix[name][low]
+
+    def distinct(self, first, last):
+        """Number of distinct keys active on any day ``first``..``last``."""
+        if self._keys is None:
+            raise ValueError("distinct counts need the RollingWindows to be built with keys")
+        low, high = self._bounds(first, last)
+        if high not in self._latest:
+            seen = self._index < high
+            latest = np.full(self._keys.max() + 1 if len(self._keys) else 0, -1)
+            np.maximum.at(latest, self._keys[seen], self._index[seen])
+            per_day = np.bincount(latest[latest >= 0], minlength=self.size)
+            self._latest[high] = np.concatenate([np.cumsum(per_day[::-1])[::-1], [0]])
+        return int(self._latest[high][low]) if low < high else 0
+
+    def summary(self, labels, distinct=None, today=None):
+        """One row per window label with every summed metric and, if named, the distinct key count."""
+        today = np.datetime64(pd.Timestamp.today() if today is None else pd.Timestamp(today), "D")
+        rows = []
+        for label in labels:
+            back_first, back_last = window_offsets(label)
+            first, last = today - np.timedelta64(back_first, "D"), today - np.timedelta64(back_last, "D")
+            row = {name: self.total(name, first, last) for name in self._prefix}
+            if distinct:
+                row[distinct] = self.distinct(first, last)
+            row["Time Frame"] = label
+            rows.append(row)
+        return pd.DataFrame(rows, columns=[*self._prefix, *([distinct] if distinct else []), "Time Frame"])
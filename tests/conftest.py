@@ -0,0 +1,59 @@
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.synthetic import SyntheticStaking
+
+EVENTS = 4_000
+
+
+@pytest.fixture(scope="session")
+def synthetic():
+    return SyntheticStaking(EVENTS, seed=7, start="2023-01-01", end="2024-12-31")
+
+
+@pytest.fixture(scope="session")
+def staking(synthetic):
+    return synthetic.staking_chunk(0, synthetic.events)
+
+
+@pytest.fixture(scope="session")
+def rewards(synthetic):
+    total = int(synthetic.events * 0.6)
+    return synthetic.rewards_chunk(0, total, total)
+
+
+@pytest.fixture(scope="session")
+def net_staked_events(staking):
+    """Successful delegations and undelegations as signed (Day, User, Amount) $AXL changes."""
+    df = staking[staking["TX_SUCCEEDED"] & staking["ACTION"].isin(["delegate", "undelegate"])]
+    sign = np.where(df["ACTION"] == "undelegate", -1.0, 1.0)
+    return pd.DataFrame({"Day": df["BLOCK_TIMESTAMP"].dt.normalize(), "User": df["DELEGATOR_ADDRESS"],
+                         "Amount": sign * df["AMOUNT"] / 1e6}).reset_index(drop=True)
+
+
+@pytest.fixture(scope="session")
+def validator_events(staking):
+    """Signed (Day, Validator, Delegator, Amount) $AXL changes; a redelegation also counts against its source."""
+    sign = np.where(staking["ACTION"] == "undelegate", -1.0, 1.0)
+    changes = pd.DataFrame({"Day": staking["BLOCK_TIMESTAMP"].dt.normalize(), "Validator": staking["VALIDATOR_ADDRESS"],
+                            "Delegator": staking["DELEGATOR_ADDRESS"], "Amount": sign * staking["AMOUNT"] / 1e6})
+    redelegations = staking[staking["ACTION"] == "redelegate"]
+    sources = pd.DataFrame({"Day": redelegations["BLOCK_TIMESTAMP"].dt.normalize(),
+                            "Validator": redelegations["REDELEGATE_SOURCE_VALIDATOR_ADDRESS"],
+                            "Delegator": redelegations["DELEGATOR_ADDRESS"], "Amount": -redelegations["AMOUNT"] / 1e6})
+    return pd.concat([changes, sources], ignore_index=True)
+
+
+@pytest.fixture
+def warehouse(staking, rewards):
+    """DuckDB holding the synthetic tables under their warehouse names."""
+    db = duckdb.connect()
+    db.execute("attach ':memory:' as axelar")
+    db.execute("create schema axelar.gov")
+    db.register("staking_frame", staking)
+    db.register("rewards_frame", rewards)
+    db.execute("create table axelar.gov.fact_staking as select * from staking_frame")
+    db.execute("create table axelar.gov.fact_staking_rewards as select * from rewards_frame")
+    return db
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from core.asof import BalanceCheckpoints
+from core.ledger import net_staked_series
+
+
+def test_totals_match_the_daily_series(net_staked_events):
+    events = net_staked_events
+    checkpoints = BalanceCheckpoints(events["Day"], events["User"], events["Amount"])
+    series = net_staked_series(events["Day"], events["User"], events["Amount"])
+    for _, row in series.iloc[::23].iterrows():
+        total, holders = checkpoints.total(row["Date"])
+        assert holders == row["Holders"]
+        assert np.isclose(total, row["Net Staked"], rtol=1e-9)
+
+
+def test_as_of_matches_summing_the_events(net_staked_events):
+    events = net_staked_events
+    checkpoints = BalanceCheckpoints(events["Day"], events["User"], events["Amount"], every="quarter")
+    for day in pd.to_datetime(["2022-12-31", "2023-01-01", "2023-06-15", "2024-03-31", "2025-06-01"]):
+        expected = events[events["Day"] <= day].groupby("User")["Amount"].sum()
+        as_of = checkpoints.as_of(day)
+        np.testing.assert_allclose(as_of.reindex(expected.index), expected, atol=1e-6)
+        assert np.allclose(as_of.drop(expected.index), 0)
+
+
+def test_full_exit_reads_zero():
+    days = pd.to_datetime(["2024-01-01", "2024-01-01", "2024-02-10"])
+    checkpoints = BalanceCheckpoints(days, ["v1", "v1", "v1"], [0.1, 0.2, -0.3])
+    assert checkpoints.as_of("2024-03-01")["v1"] == 0
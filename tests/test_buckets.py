@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from core.buckets import DISTRIBUTIONS, bucket_labels, histogram
+
+
+def test_histogram_matches_right_closed_cut(staking):
+    edges = DISTRIBUTIONS["staking_txn_volume"]["edges"]
+    values = staking["AMOUNT"] / 1e6
+    df = histogram(values, "staking_txn_volume", "Txns", edges=edges)
+
+    classes = pd.cut(values, [-np.inf, *edges, np.inf], right=True, labels=bucket_labels("staking_txn_volume", edges))
+    expected = classes.value_counts()
+    expected = expected[expected > 0]
+    assert dict(zip(df["Class"], df["Txns"])) == expected.to_dict()
+    assert df["Txns"].is_monotonic_decreasing
+
+
+def test_keys_count_each_class_once():
+    edges = (10, 100)
+    df = histogram([5, 6, 50, 500], "claimer_volume", "Claims", edges=edges, keys=["t1", "t1", "t1", "t2"])
+    assert dict(zip(df["Class"], df["Claims"])) == {"V<=10 AXL": 1, "10<V<=100 AXL": 1, "V>100 AXL": 1}
+
+
+def test_floor_labels_the_lowest_class():
+    labels = bucket_labels("staker_txn_count", (1, 5))
+    assert labels == ["n=1 Txn", "1<n<=5 Txns", "n>5 Txns"]
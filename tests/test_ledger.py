@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from core.ledger import MIN_BALANCE, net_staked_series
+
+
+def _dense_grid(events, end):
+    # The SQL's shape: every holder's balance on every calendar day, then the qualifying total per day.
+    calendar = pd.date_range(events["Day"].min(), end, freq="D")
+    changes = events.pivot_table(index="Day", columns="User", values="Amount", aggfunc="sum")
+    balances = changes.reindex(calendar, fill_value=0.0).fillna(0.0).cumsum()
+    counted = balances >= MIN_BALANCE
+    df = pd.DataFrame({"Date": calendar, "Net Staked": balances.where(counted, 0.0).sum(axis=1).to_numpy(),
+                       "Holders": counted.sum(axis=1).to_numpy()})
+    return df[df["Holders"] > 0].reset_index(drop=True)
+
+
+def test_matches_the_dense_grid(net_staked_events):
+    end = net_staked_events["Day"].max() + pd.Timedelta(days=10)
+    df = net_staked_series(net_staked_events["Day"], net_staked_events["User"], net_staked_events["Amount"], end=end)
+    expected = _dense_grid(net_staked_events, end)
+
+    assert df["Date"].tolist() == expected["Date"].tolist()
+    assert df["Holders"].tolist() == expected["Holders"].tolist()
+    np.testing.assert_allclose(df["Net Staked"], expected["Net Staked"], rtol=1e-9)
+
+
+def test_full_exit_drops_the_holder():
+    days = pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"])
+    df = net_staked_series(days, ["a", "a", "b"], [5.0, -5.0, 2.0])
+    assert df["Holders"].tolist() == [1, 1]
+    assert df["Net Staked"].tolist() == [5.0, 2.0]
+    assert df["Date"].tolist() == [days[0], days[2]]
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from core.nakamoto import balance_matrix, nakamoto_coefficients
+
+
+def _brute_coefficient(row, threshold):
+    power = np.sort(np.sqrt(row[row > 0]))[::-1]
+    shares = np.round(100 * np.cumsum(power) / power.sum(), 2)
+    return int(np.argmax(shares >= threshold)) + 1
+
+
+def test_balance_matrix_matches_pandas(validator_events):
+    matrix = balance_matrix(validator_events["Day"], validator_events["Validator"], validator_events["Amount"])
+    expected = (validator_events.pivot_table(index="Day", columns="Validator", values="Amount", aggfunc="sum")
+                .reindex(matrix.index, fill_value=0.0).fillna(0.0).cumsum())
+    np.testing.assert_allclose(matrix[expected.columns].to_numpy(), expected.to_numpy(), atol=1e-6)
+
+
+def test_coefficients_match_a_per_day_ranking(validator_events):
+    matrix = balance_matrix(validator_events["Day"], validator_events["Validator"], validator_events["Amount"])
+    df = nakamoto_coefficients(matrix, thresholds=[33.6, 50.0])
+    days = df["Date"].iloc[::37]
+    for day in days:
+        row = matrix.loc[day].to_numpy()
+        coefficients = df.loc[df["Date"] == day].iloc[0]
+        assert coefficients[33.6] == _brute_coefficient(row, 33.6)
+        assert coefficients[50.0] == _brute_coefficient(row, 50.0)
+
+
+def test_fully_undelegated_validator_reads_zero():
+    days = pd.to_datetime(["2024-01-01", "2024-01-01", "2024-01-02"])
+    matrix = balance_matrix(days, ["v1", "v1", "v1"], [0.1, 0.2, -0.3])
+    assert matrix["v1"].tolist() == [0.3, 0.0]
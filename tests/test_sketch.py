@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from core.rollup import truncate
+from core.sketch import DistinctSketches, QuantileSketches, relative_error
+
+
+def test_exact_path_counts_distinct_keys(net_staked_events):
+    events = net_staked_events
+    sketches = DistinctSketches(events["Day"], events["User"])
+    assert sketches.count() == events["User"].nunique()
+    assert sketches.count("2023-03-01", "2023-05-31") == \
+        events[(events["Day"] >= "2023-03-01") & (events["Day"] <= "2023-05-31")]["User"].nunique()
+
+    df = sketches.count_by_period("month", name="Users")
+    expected = events.groupby(truncate(events["Day"], "month").rename("Date"))["User"].nunique()
+    assert df["Users"].tolist() == expected.tolist()
+    assert df["Date"].tolist() == expected.index.tolist()
+
+
+def test_estimates_stay_within_the_error_bound():
+    rng = np.random.default_rng(1)
+    days = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 60, 200_000), unit="D")
+    keys = rng.integers(0, 50_000, len(days)).astype(str)
+    sketches = DistinctSketches(days, keys, exact_max_rows=0)
+    for first, last in [("2024-01-01", "2024-02-29"), ("2024-01-10", "2024-01-20"), ("2024-02-01", "2024-02-03")]:
+        inside = (days >= first) & (days <= last)
+        exact = len(np.unique(keys[inside]))
+        # Four standard errors: a failure here is a bug, not bad luck.
+        assert abs(sketches.count(first, last) - exact) <= 4 * relative_error() * exact
+
+
+def test_quantiles_within_relative_accuracy(staking):
+    amounts = staking["AMOUNT"] / 1e6
+    sketches = QuantileSketches(staking["BLOCK_TIMESTAMP"], amounts)
+    quantiles = [0.1, 0.5, 0.9, 0.99]
+    expected = np.quantile(amounts, quantiles, method="lower")
+    np.testing.assert_allclose(sketches.quantiles(quantiles), expected, rtol=sketches.relative_accuracy)
+
+    df = sketches.quantiles_by_period("quarter", [0.5])
+    periods = truncate(staking["BLOCK_TIMESTAMP"].dt.normalize(), "quarter")
+    medians = amounts.groupby(periods.to_numpy()).quantile(0.5, interpolation="lower")
+    np.testing.assert_allclose(df["P50"], medians.to_numpy(), rtol=sketches.relative_accuracy)
+
+
+def test_weights_count_as_repeated_values():
+    days = pd.to_datetime(["2024-01-01"] * 3)
+    weighted = QuantileSketches(days, [1.0, 10.0, 100.0], weights=[1, 5, 1])
+    repeated = QuantileSketches(pd.to_datetime(["2024-01-01"] * 7), [1.0] + [10.0] * 5 + [100.0])
+    assert weighted.quantiles([0.1, 0.5, 0.9]).tolist() == repeated.quantiles([0.1, 0.5, 0.9]).tolist()
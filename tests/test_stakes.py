@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+from core.stakes import StakeMatrix, sum_at_least
+
+
+def test_exit_to_zero_is_not_a_stake():
+    matrix = StakeMatrix(["d1", "d1", "d1", "d2"], ["v1"] * 4, [0.1, 0.2, -0.3, 5.0])
+    assert matrix.stakers().to_dict() == {"v1": 1}
+    assert matrix.validator_totals().to_dict() == {"v1": 5.0}
+
+
+def test_drained_validator_has_no_stake():
+    matrix = StakeMatrix(["d1", "d1", "d1", "d2"], ["v1", "v1", "v1", "v2"], [0.1, 0.2, -0.3, 5.0])
+    assert matrix.validator_totals()["v1"] == 0
+    assert matrix.stakers()["v1"] == 0
+    assert matrix.top_delegators("v1").empty
+
+
+def test_apply_matches_a_full_build():
+    rng = np.random.default_rng(0)
+    delegators = rng.choice([f"d{i}" for i in range(40)], 500)
+    validators = rng.choice([f"v{i}" for i in range(8)], 500)
+    amounts = np.round(rng.normal(0, 10, 500), 6)
+    full = StakeMatrix(delegators, validators, amounts)
+    applied = StakeMatrix(delegators[:300], validators[:300], amounts[:300]).apply(
+        delegators[300:], validators[300:], amounts[300:])
+
+    pairs = pd.DataFrame({"Validator": validators, "Delegator": delegators, "Stake": amounts})
+    pairs = pairs.groupby(["Validator", "Delegator"])["Stake"].sum().round(6)
+    totals = pairs.groupby(level="Validator").sum()
+    stakers = (pairs > 0).groupby(level="Validator").sum()
+
+    np.testing.assert_allclose(full.validator_totals()[totals.index], totals)
+    np.testing.assert_allclose(applied.validator_totals()[totals.index], totals)
+    assert full.stakers()[stakers.index].tolist() == stakers.tolist()
+    assert applied.stakers()[stakers.index].tolist() == stakers.tolist()
+
+def test_apply_leaves_the_original_unchanged():
+    matrix = StakeMatrix(["d1"], ["v1"], [5.0])
+    matrix.apply(["d1"], ["v1"], [-5.0])
+    assert matrix.stakers().to_dict() == {"v1": 1}
+
+
+def test_sum_at_least_matches_sql_running_sums():
+    values = [5.0, 3.0, 3.0, 1.0]
+    # sum(x) over (order by x desc): peers share the running total of the last of them.
+    assert sum_at_least(values).tolist() == [5.0, 11.0, 11.0, 12.0]
+
+
+class _Changes:
+    """In-memory ``delegation_changes_since`` over a list of (timestamp, delegator, validator, amount) events."""
+
+    def __init__(self, events):
+        self.events = pd.DataFrame(events, columns=["Timestamp", "Delegator", "Validator", "Balance Change"])
+        self.queries = 0
+
+    def version(self, source):
+        return str(self.events["Timestamp"].max())
+
+    def run_query(self, name, params):
+        self.queries += 1
+        df = self.events[self.events["Timestamp"] > pd.Timestamp(params[0])]
+        df = df.assign(Date=df["Timestamp"].dt.normalize())
+        return (df.groupby(["Date", "Delegator", "Validator"], as_index=False)
+                  .agg(**{"Balance Change": ("Balance Change", "sum"), "Last Event": ("Timestamp", "max")}))
+
+
+def _totals(matrix):
+    return matrix.validator_totals().sort_index().to_dict()
+
+
+def test_live_stakes_carries_forward_and_rolls_over(monkeypatch):
+    import core.stakes
+
+    changes = _Changes([(pd.Timestamp("2024-05-01 10:00"), "d1", "v1", 10.0),
+                        (pd.Timestamp("2024-05-02 09:00"), "d2", "v1", 4.0)])
+    monkeypatch.setattr(core.stakes, "data_version", changes.version)
+    monkeypatch.setattr(core.stakes, "run_query", changes.run_query)
+    live = core.stakes.LiveStakes()
+
+    settled, current = live.refresh(today="2024-05-02")
+    assert _totals(settled) == {"v1": 10.0}
+    assert _totals(current) == {"v1": 14.0}
+
+    changes.events.loc[len(changes.events)] = [pd.Timestamp("2024-05-02 15:00"), "d1", "v2", 1.0]
+    settled, current = live.refresh(today="2024-05-02")
+    assert _totals(settled) == {"v1": 10.0}
+    assert _totals(current) == {"v1": 14.0, "v2": 1.0}
+    assert changes.queries == 2
+
+    # A new day settles yesterday's changes without another query.
+    settled, current = live.refresh(today="2024-05-03")
+    assert _totals(settled) == _totals(current) == {"v1": 14.0, "v2": 1.0}
+    assert changes.queries == 2
+
+    fresh = core.stakes.LiveStakes().refresh(today="2024-05-03")
+    assert _totals(fresh[0]) == _totals(settled)
+    assert fresh[0].stakers().sort_index().to_dict() == settled.stakers().sort_index().to_dict()
+
+
+def test_synthetic_history_matches_pandas(validator_events):
+    events = validator_events
+    matrix = StakeMatrix(events["Delegator"], events["Validator"], events["Amount"])
+    pairs = events.groupby(["Validator", "Delegator"])["Amount"].sum().round(6)
+    np.testing.assert_allclose(matrix.validator_totals()[pairs.index.levels[0]],
+                               pairs.groupby(level="Validator").sum(), atol=1e-6)
+    stakers = (pairs > 0).groupby(level="Validator").sum()
+    assert matrix.stakers()[stakers.index].tolist() == stakers.tolist()
@@ -0,0 +1,42 @@
+import duckdb
+import numpy as np
+import pandas as pd
+
+from core.queries import MIRROR_QUERIES
+
+
+def _warehouse():
+    rng = np.random.default_rng(0)
+    rows = []
+    for tx in range(40):
+        timestamp = pd.Timestamp("2024-03-01") + pd.Timedelta(hours=int(tx // 3))   # several txs per timestamp
+        for message in range(int(rng.integers(1, 4))):                             # several rows per tx
+            rows.append((timestamp, f"tx{tx:03d}", True, "uaxl", rng.choice(["delegate", "undelegate", "redelegate"]),
+                         f"axelar1d{message}", f"axelarvaloper{message}", float(rng.choice([5e10, 2e11]))))
+    df = pd.DataFrame(rows, columns=["BLOCK_TIMESTAMP", "TX_ID", "TX_SUCCEEDED", "CURRENCY", "ACTION",
+                                     "DELEGATOR_ADDRESS", "VALIDATOR_ADDRESS", "AMOUNT"])
+    db = duckdb.connect()
+    db.execute("attach ':memory:' as axelar")
+    db.execute("create schema axelar.gov")
+    db.execute("create table axelar.gov.fact_staking as select * from df")
+    return db, df
+
+
+def test_pages_cover_every_row_once():
+    db, df = _warehouse()
+    threshold, start, page_size = 100_000, pd.Timestamp("2024-03-01").to_pydatetime(), 4
+    cursor = (pd.Timestamp("2024-03-03").to_pydatetime(), "")
+    pages = []
+    while True:
+        page = db.execute(MIRROR_QUERIES["whale_events_page"], (threshold, start, cursor[0], cursor[0], cursor[1], page_size)).df()
+        pages.append(page)
+        if page["Cursor Tx"].nunique() < page_size:
+            break
+        cursor = (pd.Timestamp(page["Cursor Timestamp"].iloc[-1]).to_pydatetime(), page["Cursor Tx"].iloc[-1])
+
+    shown = pd.concat(pages, ignore_index=True)
+    expected = df[df["AMOUNT"] / 1e6 >= threshold]
+    assert len(shown) == len(expected)
+    assert sorted(zip(shown["Cursor Tx"], shown["🐋Staker"], shown["👩‍💻Validator"])) == \
+        sorted(zip(expected["TX_ID"], expected["DELEGATOR_ADDRESS"], expected["VALIDATOR_ADDRESS"]))
+    assert all(page["Cursor Tx"].nunique() <= page_size for page in pages)
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.windows import RollingWindows
+
+
+def test_totals_and_distinct_match_brute_force(net_staked_events):
+    events = net_staked_events
+    windows = RollingWindows(events["Day"], {"Amount": events["Amount"], "Rows": np.ones(len(events), dtype=np.int64)},
+                             keys=events["User"])
+    rng = np.random.default_rng(0)
+    start = events["Day"].min()
+    for _ in range(50):
+        first = start + pd.Timedelta(days=int(rng.integers(-10, 700)))
+        last = first + pd.Timedelta(days=int(rng.integers(0, 120)))
+        inside = events[(events["Day"] >= first) & (events["Day"] <= last)]
+        first, last = np.datetime64(first, "D"), np.datetime64(last, "D")
+        assert np.isclose(windows.total("Amount", first, last), inside["Amount"].sum())
+        assert windows.total("Rows", first, last) == len(inside)
+        assert windows.distinct(first, last) == inside["User"].nunique()
+
+
+def test_summary_windows_are_inclusive():
+    days = pd.to_datetime(["2024-01-01", "2024-01-07", "2024-01-08"])
+    windows = RollingWindows(days, {"Count": [1, 1, 1]}, keys=["a", "b", "a"])
+    df = windows.summary(["24h", "7d"], distinct="Users", today="2024-01-08")
+    assert df["Count"].tolist() == [1, 2]   # "24h" is yesterday only; "7d" is today and the six days before
+    assert df["Users"].tolist() == [1, 2]
+
+
+def test_distinct_without_keys_is_an_error():
+    windows = RollingWindows(pd.to_datetime(["2024-01-01"]), {"Count": [1]})
+    with pytest.raises(ValueError):
+        windows.distinct(np.datetime64("2024-01-01"), np.datetime64("2024-01-01"))